@@ -0,0 +1,223 @@
+"""
+Background summarization of old conversation turns on a cheaper model.
+
+TokenBudgetConversationManager keeps the history under a token budget by
+dropping old turns, and what they contained is lost. Summarizing them instead
+(as Strands' SummarizingConversationManager does) costs a model call, and
+doing it when the budget is hit puts that call in front of the user's turn.
+BackgroundSummarizingConversationManager summarizes early, off the critical path:
+
+    manager = BackgroundSummarizingConversationManager(max_tokens=8000)
+    agent = Agent(conversation_manager=manager, hooks=[manager])
+
+- Once the history passes a watermark below the budget (summarize_at, 70% by
+  default), the older turns are rendered into a plain-text transcript and
+  summarized on a worker thread by a separate, cheaper model (Claude 3.5 Haiku
+  on Bedrock unless another model is given). The agent's turn does not wait
+  for it.
+- When the summary is ready, it is swapped in at the next turn boundary (never
+  in the middle of a tool loop) in a single slice assignment: the summarized
+  messages are removed and the summary is prepended to the first remaining
+  user prompt, so roles still alternate and the history still starts with a
+  user message.
+- If the history reaches the budget before the summary is ready, the usual
+  token-budget trimming applies (evict large tool results, then drop the oldest
+  turns). A summary that arrives afterwards still replaces whatever is left of
+  the turns it covers, so their content is not lost.
+
+Only one summary is computed at a time. Each new one covers the previous
+summary too, since it sits in the first prompt of the turns being summarized.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional
+
+from strands import Agent
+from strands.models import Model
+from strands.types.content import Message, Messages
+
+from token_conversation_manager import TokenBudgetConversationManager, _has, _is_prompt
+
+if TYPE_CHECKING:
+    from history_compactor import HistoryCompactor
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
+
+# Characters of each text, tool input or tool result kept in the transcript sent to the summarizer
+MAX_TRANSCRIPT_BLOCK_CHARS = 1500
+
+SUMMARY_PREFIX = "[Summary of the earlier conversation]"
+
+SUMMARY_SYSTEM_PROMPT = """You summarize conversations between a user and an AI assistant.
+Write a concise summary in bullet points, in the third person, covering:
+- The topics and questions discussed, and the answers given
+- Facts the user shared about themselves or their task
+- Tools that were called and the key results they returned
+- Decisions made and anything still open
+Do not address the user and do not add anything that is not in the transcript."""
+
+
+def _clip(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_TRANSCRIPT_BLOCK_CHARS else text[:MAX_TRANSCRIPT_BLOCK_CHARS] + " …"
+
+
+def render_transcript(messages: Messages) -> str:
+    """Plain-text transcript of messages, so the summarizer needs no tool configuration."""
+    lines = []
+    for message in messages:
+        speaker = "User" if message["role"] == "user" else "Assistant"
+        for block in message.get("content", []):
+            if "text" in block:
+                lines.append(f"{speaker}: {_clip(block['text'])}")
+            elif "toolUse" in block:
+                tool_use = block["toolUse"]
+                lines.append(f"Assistant called {tool_use['name']}: {_clip(str(tool_use.get('input')))}")
+            elif "toolResult" in block:
+                parts = [str(item.get("text", item.get("json", ""))) for item in block["toolResult"].get("content", [])]
+                lines.append(f"Tool result ({block['toolResult'].get('status', 'success')}): {_clip(' '.join(parts))}")
+    return "\n".join(lines)
+
+
+def _is_summary(block: dict[str, Any]) -> bool:
+    return block.get("text", "").startswith(SUMMARY_PREFIX)
+
+
+def _attach_summary(message: Message, summary_block: dict[str, Any]) -> None:
+    # A new content list (cached token counts are invalidated), on the same message object (tracked by identity)
+    message["content"] = [summary_block] + [block for block in message["content"] if not _is_summary(block)]
+
+
+class BackgroundSummarizingConversationManager(TokenBudgetConversationManager):
+    """Summarizes older turns in the background once the history passes a watermark.
+
+    Args:
+        max_tokens: Estimated tokens the message history may use; trimming applies above this.
+        summarize_at: Fraction of max_tokens at which a background summary is started.
+        keep_ratio: Fraction of max_tokens kept verbatim (newest turns) when summarizing.
+        summary_model: Model used for summaries; defaults to Claude 3.5 Haiku on Bedrock.
+        large_result_tokens: See TokenBudgetConversationManager.
+        compactor: See TokenBudgetConversationManager.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 20_000,
+        summarize_at: float = 0.7,
+        keep_ratio: float = 0.4,
+        summary_model: Optional[Model] = None,
+        large_result_tokens: int = 500,
+        compactor: Optional["HistoryCompactor"] = None,
+    ):
+        super().__init__(max_tokens=max_tokens, large_result_tokens=large_result_tokens, compactor=compactor)
+        self.summarize_at = summarize_at
+        self.keep_ratio = keep_ratio
+        self._summary_model = summary_model
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+        self._lock = threading.Lock()
+        # The pending summary and the messages it covers
+        self._job: Optional[tuple[Future, list[Message]]] = None
+        self.summaries_applied = 0
+        self.fallback_trims = 0
+
+    @property
+    def summary_model(self) -> Model:
+        if self._summary_model is None:
+            from strands.models import BedrockModel
+
+            self._summary_model = BedrockModel(model_id=SUMMARY_MODEL_ID, temperature=0.0)
+        return self._summary_model
+
+    def apply_management(self, agent: "Agent", **kwargs: Any) -> None:
+        """Swap in a finished summary at a turn boundary, trim if still over budget, and start a summary if due."""
+        messages = agent.messages
+        # Mid tool loop the last message is a toolResult the model has yet to answer
+        if messages and not _has(messages[-1], "toolResult"):
+            self._apply_summary(messages)
+
+        total = self.total_tokens(messages)
+        if total > self.max_tokens:
+            if self._job is not None:
+                self.fallback_trims += 1
+                logger.debug("tokens=<%d> | summary not ready, trimming instead", total)
+            first = messages[0]
+            super().apply_management(agent)
+            # Carry an applied summary over to the new first prompt rather than trimming it away
+            summary_blocks = [block for block in first["content"] if _is_summary(block)]
+            if summary_blocks and messages[0] is not first:
+                _attach_summary(messages[0], summary_blocks[0])
+            total = self.total_tokens(messages)
+
+        if total >= self.max_tokens * self.summarize_at:
+            self._start_summary(messages)
+
+    def reduce_context(self, agent: "Agent", e: Optional[Exception] = None, **kwargs: Any) -> None:
+        """On a context window overflow, use a finished summary if there is one, otherwise trim."""
+        if not self._apply_summary(agent.messages):
+            super().reduce_context(agent, e=e)
+
+    def _split_point(self, messages: Messages) -> int:
+        """Index of the oldest prompt whose turns fit in the kept share of the budget; 0 if none can be summarized."""
+        keep = self.max_tokens * self.keep_ratio
+        prompts = [index for index, message in enumerate(messages) if index and _is_prompt(message)]
+        for index in prompts:
+            if sum(self.count(message) for message in messages[index:]) <= keep:
+                return index
+        # Always keep the newest turn, however large
+        return prompts[-1] if prompts else 0
+
+    def _start_summary(self, messages: Messages) -> None:
+        with self._lock:
+            if self._job is not None:
+                return
+            split = self._split_point(messages)
+            if not split:
+                return
+            covered = messages[:split]
+            # Rendered here so the worker never reads messages the agent may be changing
+            transcript = render_transcript(covered)
+            self._job = (self._executor.submit(self._summarize, transcript), covered)
+        logger.debug("messages=<%d> | started background summary", split)
+
+    def _summarize(self, transcript: str) -> str:
+        summarizer = Agent(model=self.summary_model, system_prompt=SUMMARY_SYSTEM_PROMPT, callback_handler=None)
+        return str(summarizer(f"Summarize this conversation:\n\n{transcript}")).strip()
+
+    def _apply_summary(self, messages: Messages) -> bool:
+        """Replace the messages a finished summary covers with the summary. Returns True if it was applied."""
+        with self._lock:
+            if self._job is None or not self._job[0].done():
+                return False
+            future, covered = self._job
+            self._job = None
+        try:
+            summary = future.result()
+        except Exception as e:
+            logger.warning("error=<%s> | background summary failed", e)
+            return False
+
+        # Trimming may have dropped some or all of the covered messages meanwhile; messages only leave from the front
+        present = {id(message) for message in messages}
+        remaining = [message for message in covered if id(message) in present]
+        cut = next(index for index, message in enumerate(messages) if message is remaining[-1]) + 1 if remaining else 0
+        if cut >= len(messages) or not _is_prompt(messages[cut]):
+            logger.warning("cut=<%d> | no user prompt to attach the summary to, discarding it", cut)
+            return False
+
+        _attach_summary(messages[cut], {"text": f"{SUMMARY_PREFIX}\n{summary}"})
+        self.removed_message_count += cut
+        messages[:] = messages[cut:]
+        self.summaries_applied += 1
+        logger.debug("removed=<%d>, tokens=<%d> | applied background summary", cut, self.total_tokens(messages))
+        return True
+
+    def get_state(self) -> dict[str, Any]:
+        return {**super().get_state(), "summaries_applied": self.summaries_applied}
+
+    def restore_from_session(self, state: dict[str, Any]) -> Optional[list[Message]]:
+        self.summaries_applied = state.get("summaries_applied", 0)
+        return super().restore_from_session(state)
@@ -0,0 +1,185 @@
+"""
+Dependency-aware tool executor for Strands agents.
+
+A single model turn often mixes independent lookups (weather + time) with
+dependent steps (screenshot -> email). ConcurrentToolExecutor runs them all at
+once and SequentialToolExecutor runs them all in order. DependencyAwareToolExecutor
+builds a DAG for each batch of tool calls from declared annotations and runs
+independent branches concurrently while keeping order inside each chain, so the
+batch takes roughly as long as its critical path.
+
+Annotations can be passed to the executor or attached to the tools themselves:
+
+    executor = DependencyAwareToolExecutor(
+        dependencies={"email_tool": {"screenshot_tool"}},  # email waits for every screenshot
+        serialize={"screenshot_tool"},                       # one screenshot at a time
+        resource_groups={"db_read": "db", "db_write": "db"}, # one db call at a time
+    )
+
+    @tool_dependencies(after=["screenshot_tool"])
+    @tool
+    def email_tool(...): ...
+
+Serialized tools and tools sharing a resource group keep the order the model
+issued them in. If dependencies form a cycle the batch runs sequentially.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Iterable, Optional
+
+from strands.telemetry.metrics import Trace
+from strands.tools.executors._executor import ToolExecutor
+from strands.types._events import TypedEvent
+from strands.types.tools import ToolResult, ToolUse
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+logger = logging.getLogger(__name__)
+
+ANNOTATIONS_ATTRIBUTE = "_dag_annotations"
+
+
+def tool_dependencies(
+    after: Optional[Iterable[str]] = None, serialize: bool = False, resource_group: Optional[str] = None
+):
+    """Attach scheduling annotations to a tool for DependencyAwareToolExecutor.
+
+    Args:
+        after: Names of tools whose calls in the same batch must finish before this tool runs.
+        serialize: Run calls of this tool one at a time, in the order the model issued them.
+        resource_group: Tools sharing a group name never run at the same time.
+    """
+
+    def decorator(agent_tool):
+        setattr(agent_tool, ANNOTATIONS_ATTRIBUTE, {
+            "after": set(after or ()),
+            "serialize": serialize,
+            "resource_group": resource_group,
+        })
+        return agent_tool
+
+    return decorator
+
+
+class DependencyAwareToolExecutor(ToolExecutor):
+    """Tool executor that runs a batch of tool calls as a dependency DAG.
+
+    Args:
+        dependencies: Tool name -> names of tools it must run after, when both are in the batch.
+        serialize: Tool names whose calls run one at a time, in batch order.
+        resource_groups: Tool name -> resource group; calls in the same group run one at a time.
+    """
+
+    def __init__(
+        self,
+        dependencies: Optional[dict[str, Iterable[str]]] = None,
+        serialize: Optional[Iterable[str]] = None,
+        resource_groups: Optional[dict[str, str]] = None,
+    ):
+        self.dependencies = {name: set(after) for name, after in (dependencies or {}).items()}
+        self.serialize = set(serialize or ())
+        self.resource_groups = dict(resource_groups or {})
+
+    def _annotations(self, agent: "Agent", tool_name: str) -> tuple[set[str], bool, Optional[str]]:
+        """Merge executor-level and tool-level annotations for one tool."""
+        agent_tool = agent.tool_registry.registry.get(tool_name)
+        declared = getattr(agent_tool, ANNOTATIONS_ATTRIBUTE, {})
+        after = self.dependencies.get(tool_name, set()) | declared.get("after", set())
+        serialize = tool_name in self.serialize or declared.get("serialize", False)
+        group = self.resource_groups.get(tool_name) or declared.get("resource_group")
+        return after, serialize, group
+
+    def build_graph(self, agent: "Agent", tool_uses: list[ToolUse]) -> list[set[int]]:
+        """Return, for each tool call in the batch, the indexes of the calls it must wait for."""
+        names = [tool_use["name"] for tool_use in tool_uses]
+        annotations = [self._annotations(agent, name) for name in names]
+        predecessors: list[set[int]] = [set() for _ in tool_uses]
+
+        for i, (after, serialize, group) in enumerate(annotations):
+            for j, other in enumerate(names):
+                if i == j:
+                    continue
+                if other in after:
+                    predecessors[i].add(j)
+                elif j < i and serialize and other == names[i]:
+                    predecessors[i].add(j)
+                elif j < i and group is not None and annotations[j][2] == group:
+                    predecessors[i].add(j)
+
+        if self._has_cycle(predecessors):
+            logger.warning("tools=<%s> | tool dependencies form a cycle, running batch sequentially", names)
+            return [{i - 1} if i else set() for i in range(len(tool_uses))]
+        return predecessors
+
+    @staticmethod
+    def _has_cycle(predecessors: list[set[int]]) -> bool:
+        remaining = {i: set(preds) for i, preds in enumerate(predecessors)}
+        while remaining:
+            ready = [i for i, preds in remaining.items() if not preds]
+            if not ready:
+                return True
+            for i in ready:
+                del remaining[i]
+            for preds in remaining.values():
+                preds.difference_update(ready)
+        return False
+
+    async def _execute(
+        self,
+        agent: "Agent",
+        tool_uses: list[ToolUse],
+        tool_results: list[ToolResult],
+        cycle_trace: Trace,
+        cycle_span: Any,
+        invocation_state: dict[str, Any],
+    ) -> AsyncGenerator[TypedEvent, None]:
+        """Execute tools as a DAG: each call starts once all of its predecessors have finished.
+
+        Args:
+            agent: The agent for which tools are being executed.
+            tool_uses: Metadata and inputs for the tools to be executed.
+            tool_results: List of tool results from each tool execution.
+            cycle_trace: Trace object for the current event loop cycle.
+            cycle_span: Span object for tracing the cycle.
+            invocation_state: Context for the tool invocation.
+
+        Yields:
+            Events from the tool execution stream.
+        """
+        predecessors = self.build_graph(agent, tool_uses)
+        finished = [asyncio.Event() for _ in tool_uses]
+        task_queue: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
+        task_events = [asyncio.Event() for _ in tool_uses]
+        stop_event = object()
+
+        async def run_node(task_id: int, tool_use: ToolUse) -> None:
+            try:
+                for predecessor in predecessors[task_id]:
+                    await finished[predecessor].wait()
+
+                events = ToolExecutor._stream_with_trace(
+                    agent, tool_use, tool_results, cycle_trace, cycle_span, invocation_state
+                )
+                async for event in events:
+                    task_queue.put_nowait((task_id, event))
+                    await task_events[task_id].wait()
+                    task_events[task_id].clear()
+            finally:
+                finished[task_id].set()
+                task_queue.put_nowait((task_id, stop_event))
+
+        tasks = [asyncio.create_task(run_node(task_id, tool_use)) for task_id, tool_use in enumerate(tool_uses)]
+
+        task_count = len(tasks)
+        while task_count:
+            task_id, event = await task_queue.get()
+            if event is stop_event:
+                task_count -= 1
+                continue
+
+            yield event
+            task_events[task_id].set()
+
+        await asyncio.gather(*tasks)
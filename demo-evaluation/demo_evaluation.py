@@ -1,9 +1,159 @@
 from strands import Agent
+import asyncio
 import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import datetime
 import os
+import time
+
+# Rough output size assumed for a case before its real token usage is known
+ESTIMATED_OUTPUT_TOKENS = 500
+
+# Per-case latency components summarized by analyze_results
+LATENCY_COLUMNS = ["response_time", "time_to_first_token", "inter_token_gap_p50", "model_time", "total_tool_time"]
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount):
+        """Wait until the bucket holds amount tokens, then take them"""
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def debit(self, amount):
+        """Adjust the balance after the fact; may go negative to delay later callers"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class JsonlResultSink:
+    """Append-only JSONL writer that fsyncs every few records"""
+
+    def __init__(self, path, fsync_every=20):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.pending = 0
+        self._trim_partial_line()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _trim_partial_line(self):
+        """Drop a half-written trailing record left behind by a crash"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+
+class CaseTimings:
+    """Collects a latency breakdown for one case from the agent's stream_async events
+
+    Token counts, cycles, model latency and tool time come from the agent's event loop
+    metrics, diffed against a snapshot so a shared agent reports only this case.
+    """
+
+    def __init__(self, agent):
+        metrics = agent.event_loop_metrics
+        self.cycles_before = metrics.cycle_count
+        self.input_before = metrics.accumulated_usage["inputTokens"]
+        self.output_before = metrics.accumulated_usage["outputTokens"]
+        self.latency_before = metrics.accumulated_metrics["latencyMs"]
+        self.tool_before = {name: m.total_time for name, m in metrics.tool_metrics.items()}
+        self.first_chunk_at = None
+        self.last_chunk_at = None
+        self.gaps = []
+        self.result = None
+
+    async def consume(self, stream):
+        async for event in stream:
+            if "data" in event:
+                now = time.perf_counter()
+                if self.first_chunk_at is None:
+                    self.first_chunk_at = now
+                elif self.last_chunk_at is not None:
+                    self.gaps.append(now - self.last_chunk_at)
+                self.last_chunk_at = now
+            elif "start" in event:
+                # A new model turn: the pause spent in tools is not an inter-token gap
+                self.last_chunk_at = None
+            elif "result" in event:
+                self.result = event["result"]
+
+    def breakdown(self, case_start):
+        gaps = pd.Series(self.gaps, dtype=float)
+        breakdown = {
+            "time_to_first_token": self.first_chunk_at - case_start if self.first_chunk_at else None,
+            "inter_token_gap_p50": gaps.quantile(0.5) if len(gaps) else None,
+            "inter_token_gap_p90": gaps.quantile(0.9) if len(gaps) else None,
+            "inter_token_gap_p99": gaps.quantile(0.99) if len(gaps) else None,
+            "model_time": None,
+            "tool_time": {},
+            "cycles": 0,
+            "input_tokens": 0,
+            "output_tokens": 0
+        }
+        if self.result is None:
+            return breakdown
+
+        metrics = self.result.metrics
+        breakdown["model_time"] = (metrics.accumulated_metrics["latencyMs"] - self.latency_before) / 1000
+        breakdown["cycles"] = metrics.cycle_count - self.cycles_before
+        breakdown["input_tokens"] = metrics.accumulated_usage["inputTokens"] - self.input_before
+        breakdown["output_tokens"] = metrics.accumulated_usage["outputTokens"] - self.output_before
+        for name, tool_metrics in metrics.tool_metrics.items():
+            elapsed = tool_metrics.total_time - self.tool_before.get(name, 0.0)
+            if elapsed > 0:
+                breakdown["tool_time"][name] = elapsed
+        return breakdown
+
+
+def load_results(path):
+    """Read every complete record from a JSONL results file"""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
 
 
 class AgentEvaluator:
@@ -15,57 +165,159 @@ class AgentEvaluator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
 
-    def evaluate_agent(self, agent, agent_name):
-        """Run evaluation on an agent"""
-        results = []
+    def evaluate_agent(self, agent, agent_name, max_workers=1, agent_factory=None,
+                       requests_per_minute=None, tokens_per_minute=None, case_timeout=None,
+                       results_path=None, resume=False, fsync_every=20):
+        """Run evaluation on an agent
+
+        With max_workers > 1 the test cases run concurrently, each on its own agent
+        built by agent_factory, throttled by the per-minute request/token limits.
+        Each result is appended to a JSONL file as soon as its case finishes; with
+        resume=True, test IDs already completed without error in results_path are
+        skipped, and cases that failed or timed out run again (their new record
+        supersedes the failed one). Records are matched to cases by test ID (by position
+        only for cases without one), and results are returned in the current test case order.
+        """
+        if max_workers > 1 and agent_factory is None:
+            raise ValueError("Concurrent evaluation requires an agent_factory")
+        if resume and results_path is None:
+            raise ValueError("Resuming an evaluation requires the results_path of the earlier run")
+
+        if results_path is None:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            results_path = os.path.join(self.output_dir, f"{agent_name}_{timestamp}.jsonl")
+
+        done_ids = set()
+        if resume:
+            done_ids = {r["test_id"] for r in load_results(results_path) if r.get("test_id") and not r.get("error")}
+        pending = [
+            (index, case) for index, case in enumerate(self.test_cases)
+            if not case.get("id") or case["id"] not in done_ids
+        ]
+
         start_time = datetime.datetime.now()
 
         print(f"Starting evaluation of {agent_name} at {start_time}")
+        if done_ids:
+            print(f"Resuming: {len(self.test_cases) - len(pending)} cases already completed")
 
-        for case in self.test_cases:
-            case_start = datetime.datetime.now()
-            response = agent(case["query"])
-            case_duration = (datetime.datetime.now() - case_start).total_seconds()
-
-            results.append({
-                "test_id": case.get("id", ""),
-                "category": case.get("category", ""),
-                "query": case["query"],
-                "expected": case.get("expected", ""),
-                "actual": str(response),
-                "response_time": case_duration
-            })
+        sink = JsonlResultSink(results_path, fsync_every)
+        try:
+            asyncio.run(self._run_cases(
+                pending, sink, agent, agent_factory, max_workers,
+                TokenBucket(requests_per_minute) if requests_per_minute else None,
+                TokenBucket(tokens_per_minute) if tokens_per_minute else None,
+                case_timeout
+            ))
+        finally:
+            sink.close()
 
         total_duration = (datetime.datetime.now() - start_time).total_seconds()
 
-        # Save raw results
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_path = os.path.join(self.output_dir, f"{agent_name}_{timestamp}.json")
-        with open(results_path, "w") as f:
-            json.dump(results, f, indent=2)
-
         print(f"Evaluation completed in {total_duration:.2f} seconds")
         print(f"Results saved to {results_path}")
 
-        return results
+        return self._ordered(load_results(results_path))
+
+    @staticmethod
+    def _case_key(case_id, position):
+        """Identity of a case across runs: its ID, or its position when it has none"""
+        return ("id", case_id) if case_id else ("position", position)
+
+    def _ordered(self, results):
+        """Sort results into the current test case order, keeping the latest record per case"""
+        by_key = {}
+        for record in results:
+            by_key[self._case_key(record.get("test_id"), record.get("position"))] = record
+        keys = (self._case_key(case.get("id"), index) for index, case in enumerate(self.test_cases))
+        return [by_key[key] for key in keys if key in by_key]
+
+    async def _run_cases(self, pending, sink, agent, agent_factory, max_workers,
+                         request_bucket, token_bucket, case_timeout):
+        """Run pending test cases through a bounded worker pool, streaming results to the sink"""
+        queue = asyncio.Queue()
+        for index, case in pending:
+            queue.put_nowait((index, case))
+
+        async def worker():
+            while not queue.empty():
+                index, case = queue.get_nowait()
+                case_agent = agent_factory() if agent_factory else agent
+                record = await self._run_case(
+                    case_agent, case, request_bucket, token_bucket, case_timeout
+                )
+                record["position"] = index
+                sink.write(record)
+
+        await asyncio.gather(*(worker() for _ in range(min(max_workers, len(pending)))))
+
+    async def _run_case(self, agent, case, request_bucket, token_bucket, case_timeout):
+        """Run a single test case and build its result record"""
+        estimated_tokens = len(case["query"]) // 4 + ESTIMATED_OUTPUT_TOKENS
+        if request_bucket:
+            await request_bucket.acquire(1)
+        if token_bucket:
+            await token_bucket.acquire(estimated_tokens)
+
+        timings = CaseTimings(agent)
+        error = None
+        # A shared agent must not carry a half-finished exchange into the next case
+        history = list(agent.messages)
+        case_start = time.perf_counter()
+        try:
+            await asyncio.wait_for(timings.consume(agent.stream_async(case["query"])), timeout=case_timeout)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {case_timeout} seconds"
+        except Exception as e:
+            error = str(e)
+        if error is not None:
+            agent.messages[:] = history
+        case_duration = time.perf_counter() - case_start
+        breakdown = timings.breakdown(case_start)
+
+        if token_bucket and timings.result:
+            # Settle the estimate against what the case actually consumed
+            used_tokens = breakdown["input_tokens"] + breakdown["output_tokens"]
+            token_bucket.debit(used_tokens - estimated_tokens)
+
+        return {
+            "test_id": case.get("id", ""),
+            "category": case.get("category", ""),
+            "query": case["query"],
+            "expected": case.get("expected", ""),
+            "actual": str(timings.result or ""),
+            "response_time": case_duration,
+            "error": error,
+            **breakdown
+        }
 
     def analyze_results(self, results, agent_name):
         """Generate analysis of evaluation results"""
         df = pd.DataFrame(results)
+        df["total_tool_time"] = df["tool_time"].apply(lambda times: sum(times.values()))
+        df[LATENCY_COLUMNS] = df[LATENCY_COLUMNS].apply(pd.to_numeric)
 
         # Calculate metrics
         metrics = {
             "total_tests": len(results),
             "avg_response_time": df["response_time"].mean(),
             "max_response_time": df["response_time"].max(),
-            "categories": df["category"].value_counts().to_dict()
+            "categories": df["category"].value_counts().to_dict(),
+            "latency_percentiles": {}
         }
 
+        # p50/p90/p99 of each latency component, per category
+        for column in LATENCY_COLUMNS:
+            quantiles = df.groupby("category")[column].quantile([0.5, 0.9, 0.99]).unstack()
+            quantiles.columns = ["p50", "p90", "p99"]
+            metrics["latency_percentiles"][column] = quantiles.to_dict(orient="index")
+
         # Generate charts
         plt.figure(figsize=(10, 6))
-        df.groupby("category")["response_time"].mean().plot(kind="bar")
-        plt.title(f"Average Response Time by Category - {agent_name}")
+        df.groupby("category")["response_time"].quantile([0.5, 0.9, 0.99]).unstack().plot(kind="bar")
+        plt.title(f"Response Time Percentiles by Category - {agent_name}")
         plt.ylabel("Seconds")
+        plt.legend(["p50", "p90", "p99"])
         plt.tight_layout()
 
         chart_path = os.path.join(self.output_dir, f"{agent_name}_response_times.png")
@@ -82,11 +334,6 @@ if __name__ == "__main__":
         system_prompt="You are a helpful assistant."
     )
 
-    agent2 = Agent(
-        model="anthropic.claude-3-5-haiku-20241022-v1:0",
-        system_prompt="You are a helpful assistant."
-    )
-
     # Create evaluator
     evaluator = AgentEvaluator("test_cases.json")
 
@@ -94,10 +341,30 @@ if __name__ == "__main__":
     results1 = evaluator.evaluate_agent(agent1, "claude-sonnet")
     metrics1 = evaluator.analyze_results(results1, "claude-sonnet")
 
-    results2 = evaluator.evaluate_agent(agent2, "claude-haiku")
+    # Concurrent run: one fresh agent per in-flight case, throttled to the account quota
+    results2 = evaluator.evaluate_agent(
+        None,
+        "claude-haiku",
+        max_workers=8,
+        agent_factory=lambda: Agent(
+            model="anthropic.claude-3-5-haiku-20241022-v1:0",
+            system_prompt="You are a helpful assistant.",
+            callback_handler=None
+        ),
+        requests_per_minute=100,
+        tokens_per_minute=200000,
+        case_timeout=120
+    )
     metrics2 = evaluator.analyze_results(results2, "claude-haiku")
 
     # Compare results
     print("\nPerformance Comparison:")
     print(f"Sonnet avg response time: {metrics1['avg_response_time']:.2f}s")
-    print(f"Haiku avg response time: {metrics2['avg_response_time']:.2f}s")
\ No newline at end of file
+    print(f"Haiku avg response time: {metrics2['avg_response_time']:.2f}s")
+
+    for name, metrics in [("Sonnet", metrics1), ("Haiku", metrics2)]:
+        print(f"\n{name} latency percentiles by category:")
+        for column, by_category in metrics["latency_percentiles"].items():
+            for category, quantiles in by_category.items():
+                print(f"  {column} [{category}]: p50={quantiles['p50']:.3f}s "
+                      f"p90={quantiles['p90']:.3f}s p99={quantiles['p99']:.3f}s")
\ No newline at end of file
@@ -1,52 +1,165 @@
 from strands import Agent, tool
 from strands_tools import calculator, current_time
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
 
-@tool
-def fetch_url_content(url: str) -> str:
+import httpx
+
+import http_client
+from html_extract import EXTRACTOR_VERSION, ContentExtractor, incremental_decoder, render_markdown
+from page_cache import PageCache
+
+
+# Characters of text returned to the model
+MAX_TEXT_LENGTH = 8000
+# Characters of page text read before choosing the main content; boilerplate is discarded afterwards
+MAX_SCAN_LENGTH = 100_000
+# Hard ceiling on bytes downloaded per page, however little text they contain
+MAX_DOWNLOAD_BYTES = 2_000_000
+CHUNK_SIZE = 64 * 1024
+
+# Set a user agent to avoid being blocked
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Pages and their extracted text survive restarts; set WEB_CACHE_DB to move the cache file
+web_cache = PageCache(
+    os.environ.get('WEB_CACHE_DB', os.path.join(tempfile.gettempdir(), 'strands_web_cache.sqlite3')),
+    max_bytes=100 * 1024 * 1024
+)
+
+
+@dataclass
+class Download:
+    status_code: int
+    headers: httpx.Headers
+    body: bytes = b''
+    charset: Optional[str] = None
+    truncated: bool = False
+    extractor: Optional[ContentExtractor] = None
+
+
+async def download_page(response: httpx.Response) -> Download:
     """
-    Fetch and extract text content from a specified URL.
+    Parse a streamed HTML response into text blocks, reading only as much as needed.
 
     Args:
-        url (str): The URL to fetch content from
+        response (httpx.Response): The unread response
 
     Returns:
-        str: The extracted text content from the webpage
+        Download: The bytes read and the fed extractor, or just the headers of a 304 Not Modified
     """
-    try:
-        # Set a user agent to avoid being blocked
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    if response.status_code == 304:
+        return Download(304, response.headers)
+    response.raise_for_status()
+
+    extractor = ContentExtractor(max_chars=MAX_SCAN_LENGTH)
+    decoder = incremental_decoder(response.charset_encoding)
+    chunks = []
+    received = 0
+    truncated = False
+
+    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+        chunks.append(chunk)
+        received += len(chunk)
+        # Parsing is CPU work; keep it off the I/O loop so other requests keep flowing
+        await asyncio.to_thread(extractor.feed, decoder.decode(chunk))
+        if extractor.done or received >= MAX_DOWNLOAD_BYTES:
+            # Leaving the rest of the body unread closes the connection without downloading it
+            truncated = True
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+
+    return Download(response.status_code, response.headers, b''.join(chunks), response.charset_encoding, truncated, extractor)
+
+
+def main_content(extractor: ContentExtractor) -> str:
+    """
+    Render the main content of a parsed page, without menus, footers and other boilerplate.
+
+    Args:
+        extractor (ContentExtractor): The fed extractor
 
-        # Fetch the URL with a timeout
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+    Returns:
+        str: The page title and its main content as Markdown sections
+    """
+    return render_markdown(extractor.sections(), extractor.title)
 
-        # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
 
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+def parse_body(body: bytes, charset: Optional[str]) -> str:
+    """Extract the main content from a stored page body."""
+    extractor = ContentExtractor(max_chars=MAX_SCAN_LENGTH)
+    extractor.feed(incremental_decoder(charset).decode(body, final=True))
+    extractor.close()
+    return main_content(extractor)
 
-        # Get text content
-        text = soup.get_text()
 
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
+async def load_page(url: str) -> tuple[str, bool]:
+    """
+    Return a page's main content, from the cache when it is fresh or the origin confirms it is unchanged.
+
+    Args:
+        url (str): The URL to fetch
+
+    Returns:
+        tuple[str, bool]: The main content, and whether the page was cut short
+    """
+    page, text = await asyncio.to_thread(web_cache.get, url, EXTRACTOR_VERSION)
+
+    if page is None or page.is_stale:
+        # Revalidate stale pages; a 304 answer skips both the download and the parse
+        headers = {**HEADERS, **page.conditional_headers()} if page is not None else HEADERS
+        download = await http_client.stream(url, download_page, headers=headers)
+
+        if download.status_code == 304 and page is not None:
+            page = await asyncio.to_thread(web_cache.refresh, page, download.headers)
+        else:
+            text = await asyncio.to_thread(main_content, download.extractor)
+            page = await asyncio.to_thread(
+                web_cache.store_page, url, download.body, download.charset, download.truncated, download.headers
+            )
+            if page is not None:
+                await asyncio.to_thread(web_cache.store_text, url, EXTRACTOR_VERSION, text)
+            return text, download.truncated
+
+    if text is None:
+        # Stored by an older extractor: re-parse the stored body instead of downloading it again
+        text = await asyncio.to_thread(parse_body, page.body, page.charset)
+        await asyncio.to_thread(web_cache.store_text, url, EXTRACTOR_VERSION, text)
+
+    return text, page.truncated
+
+
+@tool
+async def fetch_url_content(url: str) -> str:
+    """
+    Fetch and extract text content from a specified URL.
+
+    Args:
+        url (str): The URL to fetch content from
+
+    Returns:
+        str: The extracted text content from the webpage
+    """
+    try:
+        # Served from the page cache when possible, otherwise streamed through the shared
+        # connection pool, keeping only the main content so navigation and footers don't
+        # eat the length budget
+        text, truncated = await load_page(url)
 
         # Limit content length to avoid token limits
-        max_length = 8000
-        if len(text) > max_length:
-            text = text[:max_length] + "\n\n[Content truncated due to length...]"
+        if truncated or len(text) > MAX_TEXT_LENGTH:
+            text = text[:MAX_TEXT_LENGTH] + "\n\n[Content truncated due to length...]"
 
         return text
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return f"Error fetching URL: {str(e)}"
     except Exception as e:
         return f"Error processing content: {str(e)}"
@@ -54,10 +167,13 @@ def fetch_url_content(url: str) -> str:
 # Create an agent with basic tools plus the URL fetcher
 agent = Agent(tools=[calculator, current_time, fetch_url_content])
 
-print(agent.model.config)
+if __name__ == "__main__":
+    print(agent.model.config)
+
+    # Ask the agent a question that uses the available tools
+    message = """
+    Please fetch the content from https://en.wikipedia.org/wiki/Artificial_intelligence and give me a brief summary."
+    """
+    agent(message)
 
-# Ask the agent a question that uses the available tools
-message = """
-Please fetch the content from https://en.wikipedia.org/wiki/Artificial_intelligence and give me a brief summary."
-"""
-agent(message)
+    print(f"\n\nWeb cache: {web_cache.report()}")
@@ -1,9 +1,139 @@
 from strands import Agent, tool
 from strands_tools import calculator, current_time
-import requests
+import asyncio
+import os
+import sys
+import time
+from urllib.parse import quote
+
+import httpx
+
+import http_client
+from response_cache import SingleFlight, TieredCache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tool_results import result_meter, tool_result
+
+
+# Seconds a weather reading is served as fresh
+WEATHER_TTL = float(os.environ.get('WEATHER_CACHE_TTL', 10 * 60))
+# Seconds past expiry a reading may still be served instantly while a background refresh runs
+STALE_WHILE_REVALIDATE = float(os.environ.get('WEATHER_STALE_TTL', 30 * 60))
+# Upstream requests in flight at once for a single get_weather_batch call
+MAX_BATCH_CONCURRENCY = 4
+# Seconds a location query stays mapped to the area wttr.in resolved it to
+RESOLUTION_TTL = 7 * 24 * 60 * 60
+
+weather_cache = TieredCache(max_entries=1024)
+weather_flight = SingleFlight()
+
+
+def normalize_location(location):
+    """Cache key form of a location query: runs of spaces collapsed, case folded."""
+    return ' '.join(location.split()).casefold()
+
+
+def area_key(area):
+    """Readings are bucketed by the resolved area's coordinates, rounded to ~10 km."""
+    return f"area:{float(area['latitude']):.1f},{float(area['longitude']):.1f}"
+
+
+def _cached(query):
+    """Return the cached reading for a query, following its resolution to an area."""
+    alias = weather_cache.get(f"alias:{query}", record_stats=False)
+    key = alias.value if alias is not None else f"query:{query}"
+    return weather_cache.get(key)
+
+
+async def _fetch_weather(query):
+    # Using wttr.in - completely free, no API key needed
+    url = f"https://wttr.in/{quote(query)}?format=j1"
+
+    response = await http_client.get(url)
+    response.raise_for_status()
+
+    data = response.json()
+    current = data['current_condition'][0]
+    location_info = data['nearest_area'][0]
+
+    weather = {
+        'city': location_info['areaName'][0]['value'],
+        'country': location_info['country'][0]['value'],
+        'temp_c': current['temp_C'],
+        'temp_f': current['temp_F'],
+        'feels_like_c': current['FeelsLikeC'],
+        'feels_like_f': current['FeelsLikeF'],
+        'conditions': current['weatherDesc'][0]['value'],
+        'humidity': current['humidity'],
+        'wind_kmph': current['windspeedKmph'],
+    }
+
+    # "London", "london, uk" and "City of London" all resolve to the same area and share a reading
+    key = area_key(location_info)
+    weather_cache.set(key, weather, WEATHER_TTL)
+    weather_cache.set(f"alias:{query}", key, RESOLUTION_TTL)
+    return weather
+
+
+def _refresh_in_background(query):
+    if not weather_flight.in_flight(query):
+        # Runs on the HTTP client's I/O loop so it outlives this agent call
+        http_client.run_in_background(lambda client: weather_flight.do(query, lambda: _fetch_weather(query)))
+
+
+async def fetch_weather(location):
+    """
+    Current weather for a location, served from the cache when possible.
+
+    Concurrent requests for the same location share one upstream request, and a
+    slightly stale reading is returned immediately while it is refreshed in the background.
+    """
+    query = normalize_location(location)
+    entry = _cached(query)
+
+    if entry is not None:
+        if not entry.is_stale:
+            return entry.value
+        if time.time() - entry.expires_at < STALE_WHILE_REVALIDATE:
+            _refresh_in_background(query)
+            return entry.value
+
+    return await weather_flight.do(query, lambda: _fetch_weather(query))
+
+
+def format_weather(weather):
+    """Human-readable rendering of a reading, used when tool results are sent as text."""
+    result = f"**Weather in {weather['city']}, {weather['country']}:**\n\n"
+    result += f"🌡️ Temperature: {weather['temp_c']}°C ({weather['temp_f']}°F)\n"
+    result += f"🤔 Feels like: {weather['feels_like_c']}°C ({weather['feels_like_f']}°F)\n"
+    result += f"☁️ Conditions: {weather['conditions']}\n"
+    result += f"💧 Humidity: {weather['humidity']}%\n"
+    result += f"💨 Wind Speed: {weather['wind_kmph']} km/h\n"
+    return result
+
+
+def format_weather_line(reading):
+    """One line per location in a batch: the reading, or why there is none."""
+    if reading['status'] == 'error':
+        return f"{reading['location']}: {reading['error']}"
+    return (
+        f"{reading['city']}, {reading['country']}: {reading['temp_c']}°C ({reading['temp_f']}°F), "
+        f"feels like {reading['feels_like_c']}°C, {reading['conditions']}, "
+        f"humidity {reading['humidity']}%, wind {reading['wind_kmph']} km/h"
+    )
+
+
+def describe_error(error):
+    """Why a reading failed: only a 404 from wttr.in means the location is unknown."""
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 404:
+        return "not found"
+    if isinstance(error, httpx.HTTPError):
+        return f"weather service unavailable ({type(error).__name__}), try again later"
+    return f"error processing weather data ({error})"
+
 
 @tool
-def get_weather(location: str) -> str:
+async def get_weather(location: str) -> dict:
     """
     Get current weather for any city worldwide.
 
@@ -11,46 +141,55 @@ def get_weather(location: str) -> str:
         location (str): City name (e.g., "London", "New York", "Tokyo")
 
     Returns:
-        str: Current weather information including temperature, conditions, humidity, and wind
+        dict: Current weather information including temperature, conditions, humidity, and wind
     """
     try:
-        # Using wttr.in - completely free, no API key needed
-        url = f"https://wttr.in/{location}?format=j1"
-        headers = {'User-Agent': 'StrandsBot/1.0'}
-
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-        current = data['current_condition'][0]
-        location_info = data['nearest_area'][0]
-
-        city = location_info['areaName'][0]['value']
-        country = location_info['country'][0]['value']
-        temp_c = current['temp_C']
-        temp_f = current['temp_F']
-        desc = current['weatherDesc'][0]['value']
-        humidity = current['humidity']
-        wind_speed = current['windspeedKmph']
-        feels_like_c = current['FeelsLikeC']
-        feels_like_f = current['FeelsLikeF']
-
-        result = f"**Weather in {city}, {country}:**\n\n"
-        result += f"🌡️ Temperature: {temp_c}°C ({temp_f}°F)\n"
-        result += f"🤔 Feels like: {feels_like_c}°C ({feels_like_f}°F)\n"
-        result += f"☁️ Conditions: {desc}\n"
-        result += f"💧 Humidity: {humidity}%\n"
-        result += f"💨 Wind Speed: {wind_speed} km/h\n"
-
-        return result
-
-    except requests.exceptions.RequestException as e:
-        return f"Error getting weather for '{location}'. Please check the city name and try again."
+        weather = await fetch_weather(location)
+        return tool_result('get_weather', weather, text=lambda: format_weather(weather))
+
     except Exception as e:
-        return f"Error processing weather data: {str(e)}"
+        reason = describe_error(e)
+        if reason == "not found":
+            message = f"Error getting weather for '{location}'. Please check the city name and try again."
+        else:
+            message = f"Error getting weather for '{location}': {reason}."
+        return tool_result('get_weather', {'error': message}, text=message, status='error')
+
+
+@tool
+async def get_weather_batch(locations: list[str]) -> dict:
+    """
+    Get current weather for several cities at once. Use this instead of calling get_weather repeatedly.
+
+    Args:
+        locations (list[str]): City names (e.g., ["Tokyo", "London", "Paris"])
+
+    Returns:
+        dict: Current weather per city, each with its own success or error status
+    """
+    # Duplicates (including differently spaced or cased spellings) are fetched once
+    queries = {}
+    for location in locations:
+        queries.setdefault(normalize_location(location), location)
+
+    limit = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+
+    async def lookup(location):
+        async with limit:
+            try:
+                return {'location': location, 'status': 'success', **await fetch_weather(location)}
+            except Exception as e:
+                return {'location': location, 'status': 'error', 'error': describe_error(e)}
+
+    readings = await asyncio.gather(*(lookup(location) for location in queries.values()))
+    status = 'error' if all(reading['status'] == 'error' for reading in readings) else 'success'
+    return tool_result(
+        'get_weather_batch', {'results': readings},
+        text=lambda: '\n'.join(format_weather_line(reading) for reading in readings), status=status
+    )
 
 # Create agent with all tools
-agent = Agent(tools=[calculator, current_time, get_weather])
+agent = Agent(tools=[calculator, current_time, get_weather, get_weather_batch])
 
 if __name__ == "__main__":
     print(agent.model.config)
@@ -80,4 +219,14 @@ if __name__ == "__main__":
     # Test 4: Combined
     print("TEST 4: Combined Query")
     print("-" * 80)
-    agent("What time is it, and what's the weather in Tokyo?")
\ No newline at end of file
+    agent("What time is it, and what's the weather in Tokyo?")
+
+    print("\n" + "="*80 + "\n")
+
+    # Test 5: Several cities in one tool call
+    print("TEST 5: Multi-City Weather")
+    print("-" * 80)
+    agent("What's the weather in Tokyo, London, Paris and New York?")
+
+    print(f"\n\nWeather cache: {weather_cache.stats.as_dict()}")
+    print(f"Tool result sizes: {result_meter.report()}")
\ No newline at end of file
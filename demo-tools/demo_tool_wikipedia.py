@@ -1,9 +1,350 @@
 from strands import Agent, tool
 from strands_tools import calculator, current_time
-import requests
+from bs4 import BeautifulSoup
+from urllib.parse import quote
+import asyncio
+import base64
+import json
+import os
+import sys
+
+import http_client
+from response_cache import TieredCache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tool_results import result_meter, tool_result
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+
+# Seconds before a cached response must be revalidated, per endpoint
+CACHE_TTLS = {
+    'search': 60 * 60,
+    'summary': 6 * 60 * 60,
+    'content': 24 * 60 * 60,
+    'sections': 24 * 60 * 60,
+}
+
+# Set WIKI_CACHE_DB to a file path to keep cached responses across runs
+wiki_cache = TieredCache(max_entries=256, sqlite_path=os.environ.get('WIKI_CACHE_DB'))
+
+
+def normalize_title(title):
+    """Cache key form of a title: underscores and runs of spaces collapsed, case folded."""
+    return ' '.join(title.replace('_', ' ').split()).casefold()
+
+
+def _cached(endpoint, title):
+    """Return (key, entry) for a title, following the alias left by an earlier redirect."""
+    key = f"{endpoint}:{normalize_title(title)}"
+    alias = wiki_cache.get(f"alias:{key}", record_stats=False)
+    if alias is not None:
+        key = alias.value
+    return key, wiki_cache.get(key)
+
+
+def _store(endpoint, requested_title, value, validator=None):
+    """Cache value under its canonical title and alias the requested title to it."""
+    ttl = CACHE_TTLS[endpoint]
+    key = f"{endpoint}:{normalize_title(value['title'])}"
+    wiki_cache.set(key, value, ttl, validator)
+    requested_key = f"{endpoint}:{normalize_title(requested_title)}"
+    if requested_key != key:
+        wiki_cache.set(f"alias:{requested_key}", key, ttl)
+    return value
+
+
+async def fetch_summary(title):
+    """Summary fields for a title, served from the cache and revalidated by ETag."""
+    key, entry = _cached('summary', title)
+    if entry is not None and not entry.is_stale:
+        return entry.value
+
+    headers = {'Accept': 'application/json'}
+    if entry is not None and entry.validator:
+        headers['If-None-Match'] = entry.validator
+
+    response = await http_client.get(f"{SUMMARY_URL}{quote(title)}", headers=headers)
+    if response.status_code == 304 and entry is not None:
+        return wiki_cache.refresh(key, entry, CACHE_TTLS['summary']).value
+    response.raise_for_status()
+
+    data = response.json()
+    if data.get('type') == 'https://mediawiki.org/wiki/HyperSwitch/errors/not_found':
+        return None
+
+    return _store('summary', title, {
+        'title': data.get('title', 'Unknown'),
+        'extract': data.get('extract', 'No summary available.'),
+        'url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
+    }, response.headers.get('ETag'))
+
+
+async def _latest_revision(title):
+    params = {'action': 'query', 'format': 'json', 'titles': title, 'prop': 'info', 'redirects': 1}
+    response = await http_client.get(API_URL, params=params, headers={'Accept': 'application/json'})
+    response.raise_for_status()
+    page = next(iter(response.json().get('query', {}).get('pages', {}).values()), {})
+    return str(page.get('lastrevid', ''))
+
+
+async def fetch_content(title):
+    """Full plain-text extract for a title, served from the cache and revalidated by revision id."""
+    key, entry = _cached('content', title)
+    if entry is not None and not entry.is_stale:
+        return entry.value
+    if entry is not None and entry.validator and await _latest_revision(entry.value['title']) == entry.validator:
+        return wiki_cache.refresh(key, entry, CACHE_TTLS['content']).value
+
+    params = {
+        'action': 'query',
+        'format': 'json',
+        'titles': title,
+        'prop': 'extracts|info',
+        'explaintext': True,
+        'exsectionformat': 'plain',
+        'redirects': 1
+    }
+    response = await http_client.get(API_URL, params=params, headers={'Accept': 'application/json'})
+    response.raise_for_status()
+
+    pages = response.json().get('query', {}).get('pages', {})
+    page = next(iter(pages.values()))
+    if 'missing' in page:
+        return None
+
+    return _store('content', title, {
+        'title': page.get('title', title),
+        'extract': page.get('extract', 'No content available.'),
+    }, str(page.get('lastrevid', '')) or None)
+
+
+async def fetch_search(query, limit):
+    """OpenSearch results (titles, descriptions, urls) for a query, cached for CACHE_TTLS['search']."""
+    key = f"search:{limit}:{normalize_title(query)}"
+    entry = wiki_cache.get(key)
+    if entry is not None and not entry.is_stale:
+        return entry.value
+
+    params = {
+        'action': 'opensearch',
+        'search': query,
+        'limit': limit,
+        'format': 'json'
+    }
+    response = await http_client.get(API_URL, params=params, headers={'Accept': 'application/json'})
+    response.raise_for_status()
+
+    data = response.json()
+    return wiki_cache.set(key, data[1:4], CACHE_TTLS['search']).value
+
+
+# MediaWiki limits: titles per action=query request, and intro extracts per request
+MAX_TITLES_PER_QUERY = 50
+MAX_INTRO_EXTRACTS = 20
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def query_titles(titles, **params):
+    """Run one action=query over many titles, splitting into API-sized batches.
+
+    Returns {requested title: page dict, or None when the page is missing or invalid},
+    following the normalization and redirects reported by the API. When the API cuts a
+    batch off (e.g. extracts over its size limit), its 'continue' parameters are followed
+    and the later pages' properties are merged in.
+    """
+    batch_size = MAX_INTRO_EXTRACTS if params.get('exintro') else MAX_TITLES_PER_QUERY
+    resolved = {}
+    for batch in _chunks(titles, batch_size):
+        query_params = {'action': 'query', 'format': 'json', 'titles': '|'.join(batch), 'redirects': 1, **params}
+        renamed, renamed_redirects, pages = {}, {}, {}
+        continuation = {}
+        while True:
+            response = await http_client.get(
+                API_URL, params={**query_params, **continuation}, headers={'Accept': 'application/json'}
+            )
+            response.raise_for_status()
+            data = response.json()
+            query = data.get('query', {})
+
+            renamed.update((item['from'], item['to']) for item in query.get('normalized', []))
+            renamed_redirects.update((item['from'], item['to']) for item in query.get('redirects', []))
+            for page in query.get('pages', {}).values():
+                pages.setdefault(page.get('title'), {}).update(page)
+
+            continuation = data.get('continue')
+            if not continuation:
+                break
+
+        for title in batch:
+            final = renamed.get(title, title)
+            final = renamed_redirects.get(final, final)
+            page = pages.get(final)
+            resolved[title] = None if page is None or 'missing' in page or 'invalid' in page else page
+    return resolved
+
+
+def _unique(titles):
+    return list(dict.fromkeys(title.strip() for title in titles if title.strip()))
+
+
+async def fetch_summaries(titles):
+    """Intro summaries for many titles in as few requests as possible; cached entries are reused."""
+    unique = _unique(titles)
+    summaries = {}
+    to_fetch = []
+    for title in unique:
+        _, entry = _cached('summary', title)
+        if entry is not None and not entry.is_stale:
+            summaries[title] = entry.value
+        else:
+            to_fetch.append(title)
+
+    if to_fetch:
+        pages = await query_titles(to_fetch, prop='extracts', exintro=1, explaintext=1, exlimit='max')
+        for title, page in pages.items():
+            if page is None:
+                summaries[title] = None
+                continue
+            page_title = page['title']
+            summary = {
+                'title': page_title,
+                'extract': page.get('extract') or 'No summary available.',
+                'url': f"https://en.wikipedia.org/wiki/{quote(page_title.replace(' ', '_'))}",
+            }
+            # A missing extract may be a cut-off batch rather than an empty page, so don't cache it
+            summaries[title] = _store('summary', title, summary) if page.get('extract') else summary
+    # In the order the titles were asked for, whether cached or fetched
+    return {title: summaries[title] for title in unique}
+
+
+async def fetch_contents(titles):
+    """Full extracts for many titles.
+
+    The extracts API returns at most one full-page extract per request, so titles are resolved
+    (normalization, redirects, missing pages) in one batched query and the extracts are then
+    fetched concurrently, each through the cache.
+    """
+    unique = _unique(titles)
+    pages = await query_titles(unique, prop='info')
+    # Titles that normalize or redirect to the same page share one fetch
+    canonical = list(dict.fromkeys(pages[title]['title'] for title in unique if pages[title] is not None))
+    fetched = dict(zip(canonical, await asyncio.gather(*(fetch_content(title) for title in canonical))))
+    return {title: fetched[pages[title]['title']] if pages[title] is not None else None for title in unique}
+
+
+async def fetch_section_index(title):
+    """Section outline of an article: {'title', 'sections': [{'index', 'heading', 'level'}]}, lead first."""
+    key, entry = _cached('sections', title)
+    if entry is not None and not entry.is_stale:
+        return entry.value
+
+    params = {'action': 'parse', 'format': 'json', 'page': title, 'prop': 'sections', 'redirects': 1}
+    response = await http_client.get(API_URL, params=params, headers={'Accept': 'application/json'})
+    response.raise_for_status()
+
+    data = response.json()
+    if 'error' in data:
+        return None
+
+    parsed = data['parse']
+    sections = [{'index': '0', 'heading': 'Introduction', 'level': 1}]
+    sections += [
+        {'index': section['index'], 'heading': section['line'], 'level': int(section['level'])}
+        for section in parsed.get('sections', [])
+        # Sections transcluded from templates can't be fetched by index
+        if section.get('index', '').isdigit()
+    ]
+    return _store('sections', title, {'title': parsed['title'], 'sections': sections})
+
+
+def _html_to_text(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    for node in soup.select('sup.reference, .mw-editsection, .reflist, .navbox, style, table.metadata'):
+        node.decompose()
+    lines = (line.strip() for line in soup.get_text('\n').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+async def fetch_section_text(title, index):
+    """Plain text of one section (including its subsections), fetched on its own and cached."""
+    key = f"section:{normalize_title(title)}#{index}"
+    entry = wiki_cache.get(key)
+    if entry is not None and not entry.is_stale:
+        return entry.value
+
+    params = {
+        'action': 'parse',
+        'format': 'json',
+        'page': title,
+        'section': index,
+        'prop': 'text',
+        'disabletoc': 1,
+        'disableeditsection': 1,
+        'redirects': 1
+    }
+    response = await http_client.get(API_URL, params=params, headers={'Accept': 'application/json'})
+    response.raise_for_status()
+
+    html = response.json().get('parse', {}).get('text', {}).get('*', '')
+    text = await asyncio.to_thread(_html_to_text, html)
+    return wiki_cache.set(key, text, CACHE_TTLS['sections']).value
+
+
+def encode_cursor(title, sections, offset, max_length):
+    state = json.dumps({'t': title, 's': sections, 'o': offset, 'm': max_length}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(state.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    return state['t'], state['s'], state['o'], state['m']
+
+
+def _select_sections(outline, requested):
+    """Match requested section numbers or headings (case-insensitive) against the outline.
+
+    A section's text includes its subsections, so requested sections nested inside another
+    requested section are dropped rather than returned twice.
+    """
+    by_index = {section['index']: section for section in outline}
+    by_heading = {section['heading'].casefold(): section for section in outline}
+    selected = []
+    for name in requested:
+        section = by_index.get(str(name).strip()) or by_heading.get(str(name).strip().casefold())
+        if section is not None and section not in selected:
+            selected.append(section)
+
+    chosen = {section['index'] for section in selected}
+    nested, parents = set(), []
+    # The lead section (index 0) holds none of the others
+    for section in outline:
+        if section['index'] == '0':
+            continue
+        while parents and parents[-1]['level'] >= section['level']:
+            parents.pop()
+        if any(parent['index'] in chosen for parent in parents):
+            nested.add(section['index'])
+        parents.append(section)
+    return [section for section in selected if section['index'] not in nested]
+
+
+def format_search(query, results):
+    """Human-readable rendering of search results, used when tool results are sent as text."""
+    result = f"**Wikipedia Search Results for '{query}':**\n\n"
+    for i, item in enumerate(results, 1):
+        result += f"{i}. **{item['title']}**\n"
+        if item['description']:
+            result += f"   {item['description']}\n"
+        result += f"   {item['url']}\n\n"
+    return result
+
 
 @tool
-def search_wikipedia(query: str, limit: int = 5) -> str:
+async def search_wikipedia(query: str, limit: int = 5) -> dict:
     """
     Search Wikipedia and return a list of related article titles.
 
@@ -12,47 +353,29 @@ def search_wikipedia(query: str, limit: int = 5) -> str:
         limit (int): Number of results to return (default: 5)
 
     Returns:
-        str: A list of related Wikipedia article titles
+        dict: The related Wikipedia article titles, with descriptions and URLs
     """
     try:
-        api_url = "https://en.wikipedia.org/w/api.php"
-        headers = {
-            'User-Agent': 'StrandsBot/1.0 (Educational Purpose; Python/requests)',
-            'Accept': 'application/json'
-        }
-
-        params = {
-            'action': 'opensearch',
-            'search': query,
-            'limit': limit,
-            'format': 'json'
-        }
-
-        response = requests.get(api_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-        titles = data[1]
-        descriptions = data[2]
-        urls = data[3]
+        titles, descriptions, urls = await fetch_search(query, limit)
 
         if not titles:
-            return f"No Wikipedia articles found for '{query}'."
+            message = f"No Wikipedia articles found for '{query}'."
+            return tool_result('search_wikipedia', {'query': query, 'results': []}, text=message)
 
-        result = f"**Wikipedia Search Results for '{query}':**\n\n"
-        for i, (title, desc, url) in enumerate(zip(titles, descriptions, urls), 1):
-            result += f"{i}. **{title}**\n"
-            if desc:
-                result += f"   {desc}\n"
-            result += f"   {url}\n\n"
-
-        return result
+        results = [
+            {'title': title, 'description': desc, 'url': url}
+            for title, desc, url in zip(titles, descriptions, urls)
+        ]
+        return tool_result(
+            'search_wikipedia', {'query': query, 'results': results}, text=lambda: format_search(query, results)
+        )
 
     except Exception as e:
-        return f"Error searching Wikipedia: {str(e)}"
+        message = f"Error searching Wikipedia: {str(e)}"
+        return tool_result('search_wikipedia', {'error': message}, text=message, status='error')
 
 @tool
-def get_wikipedia_summary(title: str) -> str:
+async def get_wikipedia_summary(title: str) -> str:
     """
     Get a summary of a Wikipedia article.
 
@@ -63,24 +386,14 @@ def get_wikipedia_summary(title: str) -> str:
         str: A summary of the Wikipedia article with URL
     """
     try:
-        api_url = "https://en.wikipedia.org/api/rest_v1/page/summary/"
-        headers = {
-            'User-Agent': 'StrandsBot/1.0 (Educational Purpose; Python/requests)',
-            'Accept': 'application/json'
-        }
-
-        encoded_title = requests.utils.quote(title)
-        response = requests.get(f"{api_url}{encoded_title}", headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        summary = await fetch_summary(title)
 
-        if data.get('type') == 'https://mediawiki.org/wiki/HyperSwitch/errors/not_found':
+        if summary is None:
             return f"No Wikipedia article found for '{title}'."
 
-        page_title = data.get('title', 'Unknown')
-        extract = data.get('extract', 'No summary available.')
-        url = data.get('content_urls', {}).get('desktop', {}).get('page', '')
+        page_title = summary['title']
+        extract = summary['extract']
+        url = summary['url']
 
         result = f"**{page_title}**\n\n{extract}\n\nRead more: {url}"
 
@@ -90,67 +403,172 @@ def get_wikipedia_summary(title: str) -> str:
         return f"Error getting Wikipedia summary: {str(e)}"
 
 @tool
-def get_wikipedia_content(title: str) -> str:
+async def get_wikipedia_sections(title: str) -> str:
     """
-    Get the full text content of a Wikipedia article.
+    List the sections of a Wikipedia article, to read only the parts you need
+    with get_wikipedia_content(title, sections=[...]).
 
     Args:
         title (str): The title of the Wikipedia article
 
     Returns:
-        str: The full text content of the Wikipedia article
+        str: The article's section outline with section numbers
     """
     try:
-        api_url = "https://en.wikipedia.org/w/api.php"
-        headers = {
-            'User-Agent': 'StrandsBot/1.0 (Educational Purpose; Python/requests)',
-            'Accept': 'application/json'
-        }
-
-        params = {
-            'action': 'query',
-            'format': 'json',
-            'titles': title,
-            'prop': 'extracts',
-            'explaintext': True,
-            'exsectionformat': 'plain'
-        }
-
-        response = requests.get(api_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-        pages = data.get('query', {}).get('pages', {})
-        page = next(iter(pages.values()))
-
-        if 'missing' in page:
+        outline = await fetch_section_index(title)
+
+        if outline is None:
             return f"No Wikipedia article found for '{title}'."
 
-        extract = page.get('extract', 'No content available.')
-        page_title = page.get('title', title)
+        result = f"**Sections of {outline['title']}:**\n\n"
+        for section in outline['sections']:
+            indent = "  " * (section['level'] - 1)
+            result += f"{indent}{section['index']}. {section['heading']}\n"
+
+        return result
+
+    except Exception as e:
+        return f"Error getting Wikipedia sections: {str(e)}"
+
+@tool
+async def get_wikipedia_content(
+    title: str = "", sections: list[str] | None = None, cursor: str | None = None, max_length: int = 10000
+) -> str:
+    """
+    Get the text content of a Wikipedia article, one page of text at a time.
 
-        # Limit content length
-        max_length = 10000
-        if len(extract) > max_length:
-            extract = extract[:max_length] + "\n\n[Content truncated due to length...]"
+    Pass section numbers or headings (from get_wikipedia_sections) to fetch only those
+    sections instead of the whole article. Long results end with a cursor; call again
+    with just that cursor to read the next page without repeating earlier text (pages
+    keep the max_length of the first call).
+
+    Args:
+        title (str): The title of the Wikipedia article
+        sections (list[str]): Optional section numbers or headings to fetch
+        cursor (str): Cursor returned by a previous call, to continue reading
+        max_length (int): Maximum characters to return per call (default: 10000)
+
+    Returns:
+        str: The requested text of the Wikipedia article
+    """
+    try:
+        offset = 0
+        if cursor:
+            title, sections, offset, max_length = decode_cursor(cursor)
+
+        if sections:
+            outline = await fetch_section_index(title)
+            if outline is None:
+                return f"No Wikipedia article found for '{title}'."
+
+            page_title = outline['title']
+            selected = _select_sections(outline['sections'], sections)
+            if not selected:
+                headings = ', '.join(section['heading'] for section in outline['sections'])
+                return f"No matching sections in '{page_title}'. Available sections: {headings}"
+
+            texts = await asyncio.gather(*(fetch_section_text(page_title, section['index']) for section in selected))
+            extract = '\n\n'.join(
+                f"== {section['heading']} ==\n{text}" for section, text in zip(selected, texts)
+            )
+        else:
+            content = await fetch_content(title)
+
+            if content is None:
+                return f"No Wikipedia article found for '{title}'."
+
+            extract = content['extract']
+            page_title = content['title']
+
+        # Return one page of text and a cursor for the rest
+        chunk = extract[offset:offset + max_length]
+        end = offset + len(chunk)
+        if end < len(extract):
+            next_cursor = encode_cursor(title, sections, end, max_length)
+            chunk += (f"\n\n[Showing characters {offset}-{end} of {len(extract)}. "
+                      f"To continue, call get_wikipedia_content with cursor=\"{next_cursor}\"]")
 
         # Get URL
-        page_url = f"https://en.wikipedia.org/wiki/{requests.utils.quote(page_title.replace(' ', '_'))}"
+        page_url = f"https://en.wikipedia.org/wiki/{quote(page_title.replace(' ', '_'))}"
 
-        result = f"**{page_title}**\n\nURL: {page_url}\n\n{extract}"
+        result = f"**{page_title}**\n\nURL: {page_url}\n\n{chunk}"
 
         return result
 
     except Exception as e:
         return f"Error getting Wikipedia content: {str(e)}"
 
+@tool
+async def get_wikipedia_summaries(titles: list[str]) -> str:
+    """
+    Get summaries of several Wikipedia articles at once. Prefer this over repeated
+    get_wikipedia_summary calls when comparing or looking up multiple articles.
+
+    Args:
+        titles (list[str]): The titles of the Wikipedia articles
+
+    Returns:
+        str: A summary of each article, or a not-found marker for missing articles
+    """
+    try:
+        summaries = await fetch_summaries(titles)
+
+        result = ""
+        for title, summary in summaries.items():
+            if summary is None:
+                result += f"**{title}**\n\n[No Wikipedia article found]\n\n"
+            else:
+                result += f"**{summary['title']}**\n\n{summary['extract']}\n\nRead more: {summary['url']}\n\n"
+
+        return result or "No titles given."
+
+    except Exception as e:
+        return f"Error getting Wikipedia summaries: {str(e)}"
+
+@tool
+async def get_wikipedia_contents(titles: list[str], max_length_per_article: int = 4000) -> str:
+    """
+    Get the text content of several Wikipedia articles at once. Prefer this over repeated
+    get_wikipedia_content calls when reading multiple articles.
+
+    Args:
+        titles (list[str]): The titles of the Wikipedia articles
+        max_length_per_article (int): Characters kept from each article (default: 4000)
+
+    Returns:
+        str: The text of each article, or a not-found marker for missing articles
+    """
+    try:
+        contents = await fetch_contents(titles)
+
+        result = ""
+        for title, content in contents.items():
+            if content is None:
+                result += f"**{title}**\n\n[No Wikipedia article found]\n\n"
+                continue
+
+            extract = content['extract']
+            if len(extract) > max_length_per_article:
+                extract = extract[:max_length_per_article] + "\n\n[Content truncated due to length...]"
+
+            page_url = f"https://en.wikipedia.org/wiki/{quote(content['title'].replace(' ', '_'))}"
+            result += f"**{content['title']}**\n\nURL: {page_url}\n\n{extract}\n\n"
+
+        return result or "No titles given."
+
+    except Exception as e:
+        return f"Error getting Wikipedia contents: {str(e)}"
+
 # Create agent with all tools
 agent = Agent(tools=[
     calculator, 
     current_time, 
     search_wikipedia,
     get_wikipedia_summary,
-    get_wikipedia_content
+    get_wikipedia_sections,
+    get_wikipedia_content,
+    get_wikipedia_summaries,
+    get_wikipedia_contents
 ])
 
 # Example usage
@@ -182,4 +600,22 @@ if __name__ == "__main__":
     # Test 4: Combined query
     print("TEST 4: Combined Query")
     print("-" * 80)
-    agent("Search for 'Deep Learning', then get a summary of the first result.")
\ No newline at end of file
+    agent("Search for 'Deep Learning', then get a summary of the first result.")
+
+    print("\n" + "="*80 + "\n")
+
+    # Test 5: Selected sections
+    print("TEST 5: Selected Sections")
+    print("-" * 80)
+    agent("Using only the relevant sections of the Wikipedia article 'Python (programming language)', summarize its history.")
+
+    print("\n" + "="*80 + "\n")
+
+    # Test 6: Batch summaries
+    print("TEST 6: Batch Summaries")
+    print("-" * 80)
+    agent("Compare Python, Java, Rust and Go (programming languages) using their Wikipedia summaries.")
+
+    print("\n" + "="*80 + "\n")
+    print(f"Wikipedia cache: {wiki_cache.stats.as_dict()}")
+    print(f"Tool result sizes: {result_meter.report()}")
\ No newline at end of file
@@ -0,0 +1,427 @@
+"""
+Incremental main-content extraction for the web-facing demo tools.
+
+ContentExtractor is a stdlib HTMLParser fed with decoded chunks as they
+arrive from the network. It never builds a document tree. Script, style,
+navigation and other boilerplate subtrees are skipped as they are parsed,
+and the remaining text is recorded as a flat list of blocks (paragraphs,
+headings, list items, table cells), each remembering the element chain it
+came from. Once enough text has been collected it sets `done`, so the caller
+can stop reading the response and the rest of the page is never downloaded.
+
+sections() then picks the page's main content the way readability-style
+extractors do. Every paragraph scores its parent and grandparent elements by
+length and comma count. Scores are weighted by class/id hints and discounted
+by link density. The best container, plus siblings that score nearly as well,
+is kept, and menus, footers, link farms and cookie banners are dropped. The
+kept blocks are grouped into sections under their headings, with lists and
+tables preserved, and render_markdown() turns them into compact text for the
+model.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any, Optional
+
+# Bump when a change alters extracted text, so cached extracts are rebuilt from stored bodies
+EXTRACTOR_VERSION = '3'
+
+# Subtrees whose text is never shown to a reader
+SKIP_TAGS = {
+    'script', 'style', 'noscript', 'template', 'svg', 'nav', 'iframe',
+    'footer', 'aside', 'form', 'button', 'select', 'dialog',
+}
+
+# Tags that start a new block of text
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+    'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'ol', 'p', 'pre',
+    'section', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+}
+
+# Tags whose open element is implicitly closed by another of the same kind (<li>a<li>b)
+IMPLICIT_CLOSE = {'p', 'li', 'dt', 'dd', 'tr', 'td', 'th'}
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# class/id hints, after Mozilla's Readability
+UNLIKELY_CANDIDATES = re.compile(
+    r'banner|breadcrumb|combx|comment|community|consent|cookie|disqus|extra|footer|gdpr|legends|menu|'
+    r'modal|newsletter|pager|pagination|popup|related|remark|replies|rss|share|shoutbox|sidebar|skyscraper|'
+    r'social|sponsor|subscribe|supplemental|ad-break|agegate|promo|navbar|skip-link',
+    re.I,
+)
+MAYBE_CANDIDATE = re.compile(r'and|article|body|column|content|main|shadow', re.I)
+POSITIVE_HINTS = re.compile(r'article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story', re.I)
+NEGATIVE_HINTS = re.compile(
+    r'-ad-|hidden|banner|combx|comment|com-|contact|foot|footnote|gdpr|masthead|media|meta|outbrain|promo|'
+    r'related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|widget',
+    re.I,
+)
+
+# Paragraphs shorter than this do not vote for their container
+MIN_PARAGRAPH_LENGTH = 25
+# Blocks (other than headings) whose text is mostly link text are dropped from the main content
+MAX_BLOCK_LINK_DENSITY = 0.5
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class _Element:
+    __slots__ = ('tag', 'parent', 'weight', 'text_chars', 'link_chars', 'score')
+
+    def __init__(self, tag: str, parent: Optional['_Element'], weight: int = 0):
+        self.tag = tag
+        self.parent = parent
+        self.weight = weight
+        self.text_chars = 0
+        self.link_chars = 0
+        self.score: Optional[float] = None
+
+    def ancestors(self):
+        element = self
+        while element is not None:
+            yield element
+            element = element.parent
+
+    def nearest(self, tags) -> Optional['_Element']:
+        return next((element for element in self.ancestors() if element.tag in tags), None)
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / self.text_chars if self.text_chars else 0.0
+
+
+class _Block:
+    __slots__ = ('text', 'link_chars', 'owner')
+
+    def __init__(self, text: str, link_chars: int, owner: _Element):
+        self.text = text
+        self.link_chars = link_chars
+        self.owner = owner
+
+    @property
+    def kind(self) -> str:
+        tag = self.owner.tag
+        if tag == 'p' and self.owner.parent is not None and self.owner.parent.tag in ('li', 'td', 'th'):
+            tag = self.owner.parent.tag
+        if tag in HEADING_TAGS:
+            return 'heading'
+        if tag == 'li':
+            return 'item'
+        if tag in ('td', 'th'):
+            return 'cell'
+        return 'paragraph'
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text)
+
+
+def _implicitly_closes(open_tag: str, tag: str) -> bool:
+    """Whether a start tag closes the open element without an end tag (<li>a<li>b, <p>a<div>b)."""
+    if open_tag in IMPLICIT_CLOSE and tag == open_tag:
+        return True
+    return open_tag == 'p' and tag in BLOCK_TAGS and tag != 'br'
+
+
+def _class_weight(attrs: dict) -> int:
+    weight = 0
+    for hint in (attrs.get('class'), attrs.get('id')):
+        if hint:
+            if NEGATIVE_HINTS.search(hint):
+                weight -= 25
+            if POSITIVE_HINTS.search(hint):
+                weight += 25
+    return weight
+
+
+def _is_boilerplate(tag: str, attrs: dict) -> bool:
+    if tag in SKIP_TAGS:
+        return True
+    if 'hidden' in attrs or attrs.get('aria-hidden') == 'true':
+        return True
+    style = (attrs.get('style') or '').replace(' ', '').lower()
+    if 'display:none' in style or 'visibility:hidden' in style:
+        return True
+    if attrs.get('role') in ('navigation', 'banner', 'contentinfo', 'complementary', 'dialog', 'alertdialog'):
+        return True
+    if tag in ('body', 'html', 'main', 'article', 'a'):
+        return False
+    hints = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+    return bool(UNLIKELY_CANDIDATES.search(hints)) and not MAYBE_CANDIDATE.search(hints)
+
+
+class ContentExtractor(HTMLParser):
+    """Collect text blocks from HTML fed in chunks, stopping after max_chars characters.
+
+    Args:
+        max_chars: Characters of text to collect before `done` is set; None collects everything.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self.title = ''
+        self.blocks: list[_Block] = []
+        self._root = _Element('#document', None)
+        self._stack = [self._root]
+        self._parts: list[str] = []
+        self._link_chars = 0
+        self._link_depth = 0
+        self._in_title = False
+        self._chars = 0
+        # The boilerplate element being skipped, and the elements open inside it
+        self._skip_tag: Optional[str] = None
+        self._skip_stack: list[str] = []
+
+    # --- parsing -----------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag in VOID_TAGS:
+                return
+            if self._skip_stack:
+                if _implicitly_closes(self._skip_stack[-1], tag):
+                    self._skip_stack.pop()
+                self._skip_stack.append(tag)
+                return
+            if not _implicitly_closes(self._skip_tag, tag):
+                self._skip_stack.append(tag)
+                return
+            # A sibling (or following block) closes the unclosed boilerplate element
+            self._skip_tag = None
+        if tag in VOID_TAGS:
+            if tag in BLOCK_TAGS:
+                self._flush()
+            return
+        attrs = dict(attrs)
+        if tag in BLOCK_TAGS:
+            self._close_implicit(tag)
+        if _is_boilerplate(tag, attrs):
+            self._skip_tag, self._skip_stack = tag, []
+            return
+        if tag == 'title':
+            self._in_title = True
+            return
+        if tag == 'a':
+            self._link_depth += 1
+        if tag in BLOCK_TAGS:
+            self._flush()
+        self._stack.append(_Element(tag, self._stack[-1], _class_weight(attrs)))
+
+    def _close_implicit(self, tag):
+        """Close the open elements a block start tag ends without end tags (<p>a <b>b<ul>, <li><p>a<li>).
+
+        Inline elements still open inside them are closed too; an enclosing block element that the
+        tag does not close stops the search, so a <ul> inside an <li> stays nested.
+        """
+        while True:
+            for position in range(len(self._stack) - 1, 0, -1):
+                open_tag = self._stack[position].tag
+                if _implicitly_closes(open_tag, tag):
+                    self._flush()
+                    del self._stack[position:]
+                    break
+                if open_tag in BLOCK_TAGS:
+                    return
+            else:
+                return
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags (<br/>) never open a subtree
+        if self._skip_tag is None and tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag in self._skip_stack:
+                # Close it and anything left open inside it
+                del self._skip_stack[len(self._skip_stack) - 1 - self._skip_stack[::-1].index(tag):]
+                return
+            if tag == self._skip_tag:
+                self._skip_tag = None
+                return
+            if not any(element.tag == tag for element in self._stack[1:]):
+                return
+            # The parent closed, implicitly closing the boilerplate element too
+            self._skip_tag, self._skip_stack = None, []
+        if tag == 'title':
+            self._in_title = False
+            return
+        if tag == 'a':
+            self._link_depth = max(0, self._link_depth - 1)
+        if tag in BLOCK_TAGS:
+            self._flush()
+        # Close the nearest matching element, and anything left open inside it; ignore stray end tags
+        for position in range(len(self._stack) - 1, 0, -1):
+            if self._stack[position].tag == tag:
+                del self._stack[position:]
+                break
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title = _WHITESPACE.sub(' ', self.title + data).strip()
+            return
+        if self._skip_tag is not None or self.done:
+            return
+        text = _WHITESPACE.sub(' ', data)
+        if text.strip():
+            self._parts.append(text)
+            self._chars += len(text)
+            if self._link_depth:
+                self._link_chars += len(text.strip())
+            if self.max_chars is not None and self._chars >= self.max_chars:
+                self.done = True
+
+    def _flush(self):
+        text = ''.join(self._parts).strip()
+        if text:
+            block = _Block(text, min(self._link_chars, len(text)), self._stack[-1])
+            self.blocks.append(block)
+            for element in block.owner.ancestors():
+                element.text_chars += len(text)
+                element.link_chars += block.link_chars
+        self._parts = []
+        self._link_chars = 0
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    # --- main-content selection --------------------------------------------
+
+    def _score_candidates(self) -> list[_Element]:
+        candidates = []
+        for block in self.blocks:
+            if block.kind == 'heading' or len(block.text) < MIN_PARAGRAPH_LENGTH:
+                continue
+            score = 1 + block.text.count(',') + min(len(block.text) // 100, 3)
+            parent = block.owner.parent
+            for element, share in ((parent, 1.0), (parent.parent if parent else None, 0.5)):
+                if element is None or element is self._root:
+                    continue
+                if element.score is None:
+                    element.score = _initial_score(element)
+                    candidates.append(element)
+                element.score += score * share
+
+        for element in candidates:
+            element.score *= 1 - element.link_density
+        return candidates
+
+    def main_blocks(self) -> list[_Block]:
+        """The blocks that make up the page's main content, in document order."""
+        self._flush()
+        candidates = self._score_candidates()
+        if not candidates:
+            return [block for block in self.blocks if block.kind == 'heading' or block.link_density <= MAX_BLOCK_LINK_DENSITY]
+
+        top = max(candidates, key=lambda element: element.score)
+        threshold = max(10.0, top.score * 0.2)
+        keep = {id(top)}
+        keep.update(
+            id(element) for element in candidates
+            if element.parent is top.parent and element is not top and element.score >= threshold
+        )
+
+        selected = []
+        for block in self.blocks:
+            in_main = any(id(element) in keep for element in block.owner.ancestors())
+            # Sibling paragraphs of the main container that read like prose are kept too
+            sibling_prose = (
+                block.owner.parent is top.parent and block.owner.tag == 'p'
+                and len(block.text) > 80 and block.link_density < 0.25
+            )
+            if not (in_main or sibling_prose):
+                continue
+            if block.kind != 'heading' and block.link_density > MAX_BLOCK_LINK_DENSITY:
+                continue
+            selected.append(block)
+        return selected
+
+    def sections(self) -> list[dict[str, Any]]:
+        """
+        Group the main content into sections under their headings.
+
+        Returns:
+            list[dict]: Sections as {'heading', 'level', 'content'}, where content holds
+            {'type': 'paragraph', 'text'}, {'type': 'list', 'ordered', 'items'} and
+            {'type': 'table', 'rows'} blocks. Text before the first heading has heading None.
+        """
+        sections = [{'heading': None, 'level': 0, 'content': []}]
+        group = None
+
+        for block in self.main_blocks():
+            kind = block.kind
+            content = sections[-1]['content']
+
+            if kind == 'heading':
+                sections.append({'heading': block.text, 'level': int(block.owner.nearest(HEADING_TAGS).tag[1]), 'content': []})
+                group = None
+            elif kind == 'item':
+                container = block.owner.nearest({'ul', 'ol'})
+                if group is None or group[0] is not container:
+                    content.append({'type': 'list', 'ordered': container is not None and container.tag == 'ol', 'items': []})
+                    group = (container, None)
+                content[-1]['items'].append(block.text)
+            elif kind == 'cell':
+                table, row = block.owner.nearest({'table'}), block.owner.nearest({'tr'})
+                if group is None or group[0] is not table or table is None:
+                    content.append({'type': 'table', 'rows': []})
+                    group = (table, None)
+                if group[1] is not row or row is None:
+                    content[-1]['rows'].append([])
+                    group = (table, row)
+                content[-1]['rows'][-1].append(block.text)
+            else:
+                content.append({'type': 'paragraph', 'text': block.text})
+                group = None
+
+        return [section for section in sections if section['heading'] or section['content']]
+
+
+def _initial_score(element: _Element) -> float:
+    base = {
+        'div': 5, 'article': 5, 'main': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+        'address': -3, 'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'li': -3,
+        'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5,
+    }.get(element.tag, 0)
+    return float(base + element.weight)
+
+
+def render_markdown(sections: list[dict[str, Any]], title: str = '') -> str:
+    """Render extracted sections as compact Markdown."""
+    lines = [f"# {title}", ''] if title else []
+    for section in sections:
+        if section['heading'] and section['heading'] != title:
+            lines += ['#' * min(section['level'] + 1, 6) + ' ' + section['heading'], '']
+        for block in section['content']:
+            if block['type'] == 'paragraph':
+                lines.append(block['text'])
+            elif block['type'] == 'list':
+                lines += [
+                    f"{number}. {item}" if block['ordered'] else f"- {item}"
+                    for number, item in enumerate(block['items'], 1)
+                ]
+            else:
+                for number, row in enumerate(block['rows']):
+                    lines.append('| ' + ' | '.join(cell.replace('|', '/') for cell in row) + ' |')
+                    if number == 0 and len(block['rows']) > 1:
+                        lines.append('|' + ' --- |' * len(row))
+            lines.append('')
+    return '\n'.join(lines).strip()
+
+
+def incremental_decoder(content_type_charset: Optional[str]) -> codecs.IncrementalDecoder:
+    """A decoder for the response's declared charset, falling back to UTF-8."""
+    try:
+        return codecs.getincrementaldecoder(content_type_charset or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
@@ -0,0 +1,219 @@
+"""
+Shared, pooled HTTP client for the web-facing demo tools.
+
+Every tool in this folder sends its requests through this module instead of
+opening its own connections. One httpx.AsyncClient, owned by a background I/O
+thread running its own event loop, serves the whole process:
+
+- Connections are pooled per host and kept alive between tool calls, across
+  conversations and across `agent(...)` calls (each of which runs on a fresh
+  event loop of its own), so repeat calls to en.wikipedia.org or wttr.in skip
+  the TCP + TLS handshake.
+- HTTP/2 is negotiated when the optional `h2` package is installed
+  (`pip install httpx[http2]`), multiplexing requests over one connection.
+- The pool is bounded overall and per host.
+- Idempotent requests are retried with exponential backoff and jitter on
+  connection errors, timeouts, 429 and 5xx responses, honoring Retry-After.
+- stream() hands the unread response to a callback, so a tool can stop
+  downloading a large body once it has what it needs.
+
+Tools stay `async def`: awaiting get() parks the calling coroutine while the
+I/O thread does the work, so concurrent tool calls still cost no extra threads.
+The module is safe to use from any thread and any event loop.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+USER_AGENT = 'StrandsBot/1.0 (Educational Purpose; Python/httpx)'
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Pool limits
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 10
+KEEPALIVE_EXPIRY = 60.0
+
+# Retry policy
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _IOThread:
+    """Background thread running the event loop that owns the shared client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="http-client-io", daemon=True).start()
+                self.client = httpx.AsyncClient(
+                    headers={'User-Agent': USER_AGENT},
+                    timeout=DEFAULT_TIMEOUT,
+                    follow_redirects=True,
+                    http2=_http2_available(),
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                )
+                self.loop = loop
+            return self.loop
+
+    def host_limit(self, host: str) -> asyncio.Semaphore:
+        # Only called on the I/O loop, so no locking is needed
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+        return self.host_limits[host]
+
+    def close(self) -> None:
+        with self._lock:
+            loop, client = self.loop, self.client
+            self.loop, self.client = None, None
+            self.host_limits = {}
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_io = _IOThread()
+atexit.register(_io.close)
+
+
+async def run_on_io_loop(func: Callable[[httpx.AsyncClient], Awaitable[T]]) -> T:
+    """Run func(client) on the I/O loop and await its result from any event loop.
+
+    Use this for work that must stay on the client's loop, such as consuming a streamed response.
+    """
+    loop = _io.start()
+    if asyncio.get_running_loop() is loop:
+        return await func(_io.client)
+    future = asyncio.run_coroutine_threadsafe(func(_io.client), loop)
+    return await asyncio.wrap_future(future)
+
+
+def run_in_background(func: Callable[[httpx.AsyncClient], Awaitable[T]]) -> "concurrent.futures.Future[T]":
+    """Start func(client) on the I/O loop without waiting for it.
+
+    Unlike a task on the caller's loop, the work survives the end of the caller's `agent(...)`
+    call. Failures are logged.
+    """
+    loop = _io.start()
+    future = asyncio.run_coroutine_threadsafe(func(_io.client), loop)
+    future.add_done_callback(_log_background_failure)
+    return future
+
+
+def _log_background_failure(future: concurrent.futures.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("error=<%s> | background task failed", future.exception())
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Exponential backoff with full jitter, or the server's Retry-After when it sends one."""
+    if response is not None and "Retry-After" in response.headers:
+        value = response.headers["Retry-After"]
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return min(BACKOFF_MAX, max(0.0, retry_at.timestamp() - time.time()))
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    consume: Optional[Callable[[httpx.Response], Awaitable[T]]] = None,
+    **kwargs: Any,
+) -> Any:
+    retries = MAX_RETRIES if method.upper() in RETRY_METHODS else 0
+    host = httpx.URL(url).host
+    request = client.build_request(method, url, **kwargs)
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            # The host slot is held until the body has been read, not just until the headers arrive
+            async with _io.host_limit(host):
+                response = await client.send(request, stream=True)
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return await _read(response, consume)
+                await response.aclose()
+        except (httpx.TransportError, httpx.TimeoutException):
+            if attempt == retries:
+                raise
+        delay = _retry_delay(attempt, response)
+        logger.debug("url=<%s>, attempt=<%d>, delay=<%.2f> | retrying request", url, attempt + 1, delay)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def _read(response: httpx.Response, consume: Optional[Callable[[httpx.Response], Awaitable[T]]]) -> Any:
+    try:
+        if consume is None:
+            await response.aread()
+            return response
+        return await consume(response)
+    finally:
+        await response.aclose()
+
+
+async def request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the shared pool, retrying transient failures.
+
+    Accepts the same keyword arguments as httpx.AsyncClient.build_request. The response body is
+    read before returning.
+    """
+    return await run_on_io_loop(lambda client: _send(client, method, url, **kwargs))
+
+
+async def get(url: str, **kwargs: Any) -> httpx.Response:
+    """GET a URL through the shared pool (see request())."""
+    return await request("GET", url, **kwargs)
+
+
+async def stream(url: str, consume: Callable[[httpx.Response], Awaitable[T]], method: str = "GET", **kwargs: Any) -> T:
+    """Send a request and hand the unread response to consume(response) on the I/O loop.
+
+    consume reads as much of the body as it needs (e.g. with response.aiter_bytes()) and returns
+    the result; whatever it leaves unread is never downloaded. consume may be called again, with
+    a fresh response, if the transfer fails and is retried.
+    """
+    return await run_on_io_loop(lambda client: _send(client, method, url, consume, **kwargs))
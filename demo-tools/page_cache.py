@@ -0,0 +1,226 @@
+"""
+HTTP cache for fetched web pages, on disk and bounded by size.
+
+PageCache keeps two SQLite tables:
+
+- pages: the raw body downloaded for each URL, with its validators (ETag,
+  Last-Modified) and an expiry computed from Cache-Control / Expires as RFC 9111
+  describes, including the heuristic lifetime for pages that only send Last-Modified.
+- extracts: the text extracted from each page, keyed by URL plus extractor
+  version, so changing the extractor re-parses stored bodies instead of
+  downloading them again.
+
+A fresh page is served without touching the network. A stale one is
+revalidated with If-None-Match / If-Modified-Since. A 304 answer extends the
+page's lifetime and reuses its extracted text, so an unchanged page is neither
+downloaded nor parsed again. The pages table is bounded by total body size
+and evicts least recently used pages first, along with their extracts.
+Counters are kept in a CacheStats.
+
+PageCache is thread-safe.
+"""
+
+import email.utils
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from response_cache import CacheStats
+
+# Upper bound on the heuristic lifetime of pages that send Last-Modified but no expiry
+MAX_HEURISTIC_TTL = 24 * 3600
+
+_DIRECTIVE = re.compile(r'([a-z-]+)\s*(?:=\s*"?([^",]*)"?)?', re.I)
+
+
+def cache_control(headers: Mapping[str, str]) -> dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: value or None}."""
+    return {name.lower(): value for name, value in _DIRECTIVE.findall(headers.get('Cache-Control', ''))}
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_storable(headers: Mapping[str, str]) -> bool:
+    return 'no-store' not in cache_control(headers)
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: Optional[float] = None) -> float:
+    """Seconds a response stays fresh, from Cache-Control, Expires or the Last-Modified heuristic."""
+    now = time.time() if now is None else now
+    directives = cache_control(headers)
+    if 'no-cache' in directives:
+        return 0.0
+
+    for name in ('s-maxage', 'max-age'):
+        value = directives.get(name)
+        if value is not None and value.isdigit():
+            return float(value) - float(headers.get('Age', '0') or 0)
+
+    date = _parse_date(headers.get('Date')) or now
+    expires = _parse_date(headers.get('Expires'))
+    if expires is not None:
+        return expires - date
+
+    # Heuristic freshness: 10% of the time since the page last changed
+    last_modified = _parse_date(headers.get('Last-Modified'))
+    if last_modified is not None:
+        return min(MAX_HEURISTIC_TTL, max(0.0, (date - last_modified) * 0.1))
+    return 0.0
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: bytes
+    charset: Optional[str]
+    truncated: bool
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """Size-bounded on-disk LRU of page bodies and their extracted text.
+
+    Args:
+        path: SQLite database file.
+        max_bytes: Total size of stored bodies and extracts before least recently used pages are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, charset TEXT, truncated INTEGER NOT NULL,"
+            " etag TEXT, last_modified TEXT, expires_at REAL NOT NULL, size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS extracts ("
+            " url TEXT NOT NULL REFERENCES pages (url) ON DELETE CASCADE, version TEXT NOT NULL,"
+            " text TEXT NOT NULL, size INTEGER NOT NULL, PRIMARY KEY (url, version))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        self._db.commit()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def get(self, url: str, version: str) -> tuple[Optional[CachedPage], Optional[str]]:
+        """Return the stored page for url (fresh or stale) and its text for this extractor version."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, charset, truncated, etag, last_modified, expires_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None, None
+            text = self._db.execute(
+                "SELECT text FROM extracts WHERE url = ? AND version = ?", (url, version)
+            ).fetchone()
+            self._db.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+        body, charset, truncated, etag, last_modified, expires_at = row
+        page = CachedPage(url, body, charset, bool(truncated), etag, last_modified, expires_at)
+        if page.is_stale:
+            self._count('stale')
+        else:
+            self._count('hits')
+        return page, text[0] if text else None
+
+    def store_page(
+        self, url: str, body: bytes, charset: Optional[str], truncated: bool, headers: Mapping[str, str]
+    ) -> Optional[CachedPage]:
+        """Store a downloaded body, replacing any older version and its extracts; None if not storable."""
+        page = CachedPage(
+            url, body, charset, truncated, headers.get('ETag'), headers.get('Last-Modified'),
+            time.time() + freshness_lifetime(headers),
+        )
+        if not is_storable(headers) or (page.is_stale and not page.can_revalidate):
+            return None
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._db.execute(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, charset, int(truncated), page.etag, page.last_modified, page.expires_at,
+                 len(body), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+        return page
+
+    def store_text(self, url: str, version: str, text: str) -> None:
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extracts SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM pages WHERE url = ?)",
+                (url, version, text, size, url),
+            )
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, page: CachedPage, headers: Mapping[str, str]) -> CachedPage:
+        """Extend a stale page after the origin answered 304 Not Modified."""
+        page.expires_at = time.time() + freshness_lifetime(headers)
+        page.etag = headers.get('ETag', page.etag)
+        with self._lock:
+            self.stats.revalidated += 1
+            self._db.execute(
+                "UPDATE pages SET expires_at = ?, etag = ?, last_access = ? WHERE url = ?",
+                (page.expires_at, page.etag, time.time(), page.url),
+            )
+            self._db.commit()
+        return page
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        while self._size() > self.max_bytes:
+            row = self._db.execute("SELECT url FROM pages ORDER BY last_access LIMIT 1").fetchone()
+            if row is None:
+                return
+            self._db.execute("DELETE FROM pages WHERE url = ?", row)
+            self.stats.evictions += 1
+
+    def _size(self) -> int:
+        (pages,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        (extracts,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM extracts").fetchone()
+        return pages + extracts
+
+    def report(self) -> dict[str, int]:
+        """Hit/miss counters plus the current number of pages and bytes stored."""
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()
+            return {**self.stats.as_dict(), 'pages': entries, 'bytes': self._size(), 'max_bytes': self.max_bytes}
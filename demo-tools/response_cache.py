@@ -0,0 +1,243 @@
+"""
+Bounded response cache for the web-facing demo tools.
+
+TieredCache keeps recently used entries in an in-memory LRU and, optionally,
+in an on-disk SQLite tier that survives restarts. Every entry carries its own
+expiry, so callers can use different TTLs per endpoint, plus an optional
+validator (an ETag or a revision id) for revalidating stale entries instead
+of refetching them.
+
+Expired entries are not dropped on read: get() returns them flagged as stale
+so the caller can revalidate and then refresh() them, or serve them while a
+refresh runs in the background. Hit/miss counters are kept in CacheStats.
+
+SingleFlight coalesces concurrent fetches of the same key, so a burst of
+misses for one key costs a single upstream request.
+
+All classes are thread-safe; tools call them from whichever thread and event
+loop the agent happens to be running on.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    validator: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    revalidated: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class MemoryCache:
+    """Thread-safe LRU of CacheEntry objects, bounded by entry count."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        """Store an entry and return how many entries were evicted to make room."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk LRU of JSON-serializable entries, bounded by entry count."""
+
+    def __init__(self, path: str, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, validator TEXT,"
+            " stored_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, validator, stored_at, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        value, validator, stored_at, expires_at = row
+        return CacheEntry(json.loads(value), expires_at, validator, stored_at)
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(entry.value), entry.validator, entry.stored_at, entry.expires_at, time.time()),
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+            evicted = max(0, count - self.max_entries)
+            if evicted:
+                self._db.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access LIMIT ?)",
+                    (evicted,),
+                )
+            self._db.commit()
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._db.commit()
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional SQLite tier, with hit/miss counters.
+
+    Args:
+        max_entries: Capacity of the in-memory tier.
+        sqlite_path: Path of the on-disk tier; None keeps the cache in memory only.
+        sqlite_max_entries: Capacity of the on-disk tier.
+    """
+
+    def __init__(self, max_entries: int = 256, sqlite_path: Optional[str] = None, sqlite_max_entries: int = 10_000):
+        self.memory = MemoryCache(max_entries)
+        self.disk = SQLiteCache(sqlite_path, sqlite_max_entries) if sqlite_path else None
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, amount in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def get(self, key: str, record_stats: bool = True) -> Optional[CacheEntry]:
+        """Return the entry for key, fresh or stale, or None. Counts a hit only for fresh entries."""
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+
+        if record_stats:
+            outcome = "misses" if entry is None else "stale" if entry.is_stale else "hits"
+            self._count(**{outcome: 1})
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float, validator: Optional[str] = None) -> CacheEntry:
+        entry = CacheEntry(value, time.time() + ttl, validator)
+        evicted = self.memory.set(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, entry)
+        self._count(evictions=evicted)
+        return entry
+
+    def refresh(self, key: str, entry: CacheEntry, ttl: float) -> CacheEntry:
+        """Extend a stale entry whose validator the origin confirmed is still current."""
+        self._count(revalidated=1)
+        return self.set(key, entry.value, ttl, entry.validator)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+
+class SingleFlight:
+    """Share one in-flight call per key among concurrent callers, across threads and event loops.
+
+    The first caller for a key runs the call; callers arriving while it is in flight await
+    its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, concurrent.futures.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = self._calls[key] = concurrent.futures.Future()
+
+            if leader:
+                break
+            try:
+                # Shielded so a follower's cancellation does not cancel the shared call
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled; take over the call
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._finish(key)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
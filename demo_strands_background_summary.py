@@ -0,0 +1,95 @@
+"""
+=============================================================================
+STRANDS AGENT DEMO - Background Summarization on a Cheaper Model
+=============================================================================
+
+BackgroundSummarizingConversationManager (background_summarizing_manager.py)
+summarizes older turns once the history passes 70% of its token budget. The
+summary is computed on a worker thread by a separate, cheaper model and
+swapped in at the next turn boundary, so the user's turns never wait for it.
+If the budget is reached before the summary is ready, the oldest turns are
+trimmed instead.
+
+This demo runs offline with ScriptedModels:
+1. A fast summarizer: summaries are swapped in and no turn is trimmed
+2. A slow summarizer (2 s per summary): the history is trimmed while the
+   summary is pending, and turn latency stays the same in both cases
+
+On Bedrock, leave out summary_model to summarize with Claude 3.5 Haiku:
+    manager = BackgroundSummarizingConversationManager(max_tokens=8000)
+    agent = Agent(model=bedrock_model, conversation_manager=manager, hooks=[manager])
+
+=============================================================================
+"""
+
+import statistics
+import time
+
+from strands import Agent, tool
+
+from background_summarizing_manager import SUMMARY_PREFIX, BackgroundSummarizingConversationManager
+from mock_model import Latency, ScriptedModel, text_turn, tool_turn
+
+
+@tool
+def search_tool(query: str) -> str:
+    """
+    Search for information about a topic.
+
+    Args:
+        query (str): What to search for
+
+    Returns:
+        str: Search results
+    """
+    return f"Results for {query}: " + "Some fairly long search result text. " * 40
+
+
+SCRIPT = [
+    tool_turn({"name": "search_tool", "input": {"query": "strands agents"}}),
+    text_turn("Strands is an SDK for building AI agents. " * 10),
+]
+
+SUMMARY_SCRIPT = [text_turn("* The user asked about Strands several times; search_tool was called each turn.")]
+
+
+def run(label, summary_latency, turns=20, think_time=0.2):
+    manager = BackgroundSummarizingConversationManager(
+        max_tokens=3000,
+        summary_model=ScriptedModel(SUMMARY_SCRIPT, first_token_latency=Latency.constant(summary_latency)),
+    )
+    agent = Agent(
+        model=ScriptedModel(SCRIPT),
+        tools=[search_tool],
+        conversation_manager=manager,
+        hooks=[manager],
+        callback_handler=None
+    )
+
+    durations = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        agent(f"Tell me about Strands (question {turn + 1})")
+        durations.append((time.perf_counter() - start) * 1000)
+        # The user reading the answer before asking again
+        time.sleep(think_time)
+
+    print(f"\n{label}")
+    print(f"  Turn latency p50:       {statistics.median(durations):.2f}ms (max {max(durations):.2f}ms)")
+    print(f"  History:                {len(agent.messages)} messages, ~{manager.total_tokens(agent.messages)} tokens")
+    print(f"  Summaries swapped in:   {manager.summaries_applied}")
+    print(f"  Trims while pending:    {manager.fallback_trims}")
+    print(f"  Messages removed:       {manager.removed_message_count}")
+    first = agent.messages[0]["content"][0].get("text", "")
+    print(f"  History starts with:    {first[:len(SUMMARY_PREFIX)] if first.startswith(SUMMARY_PREFIX) else first[:40]}")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*80)
+    print("BACKGROUND SUMMARIZATION (budget 3000 tokens, summary started at 70%)")
+    print("="*80)
+
+    run("DEMO 1: Fast summarizer (0.1s)", summary_latency=0.1)
+    run("DEMO 2: Slow summarizer (2s)", summary_latency=2.0)
+
+    print("\n" + "="*80)
@@ -1,16 +1,44 @@
 # kb_agent.py
+import os
 import sys
 import boto3
+from botocore.config import Config
 from datetime import datetime
-from strands import Agent, tool
+from strands import Agent, ToolContext, tool
 from strands.models import BedrockModel
 
-# Initialize Bedrock client
-bedrock_agent_runtime = boto3.client('bedrock-agent-runtime', region_name='us-east-1')
+from kb_retrieval import (
+    MAX_PARALLEL_QUERIES, ChunkLedger, KnowledgeBaseRetriever, RetrievalCache, fuse_results, pack_context,
+    normalize_query, to_chunk
+)
+from tool_results import tool_result
+
+# Initialize Bedrock client; one connection per concurrent sub-query of retrieve_multi_from_knowledge_base
+bedrock_agent_runtime = boto3.client(
+    'bedrock-agent-runtime',
+    region_name='us-east-1',
+    config=Config(max_pool_connections=MAX_PARALLEL_QUERIES)
+)
 
 # Your Knowledge Base ID (replace with your actual KB ID)
 KNOWLEDGE_BASE_ID = "YOUR_KB_ID_HERE"
 
+# Retrieval backend: the Bedrock Knowledge Base, or KB_BACKEND=local for an in-process
+# vector index built from documents you ingest (see demo_strands_local_kb.py)
+if os.environ.get('KB_BACKEND') == 'local':
+    from local_vector_index import LocalVectorIndex
+    kb_backend = LocalVectorIndex(os.environ.get('KB_LOCAL_PATH', 'kb_index'))
+else:
+    kb_backend = bedrock_agent_runtime
+
+# Near-identical queries within 5 minutes reuse the earlier results
+retriever = KnowledgeBaseRetriever(
+    kb_backend,
+    KNOWLEDGE_BASE_ID,
+    number_of_results=5,
+    cache=RetrievalCache(ttl=300, max_entries=256)
+)
+
 @tool
 def current_time() -> str:
     """
@@ -22,44 +50,97 @@ def current_time() -> str:
     now = datetime.now()
     return now.strftime("%Y-%m-%d %H:%M:%S %Z")
 
-@tool
-def retrieve_from_knowledge_base(query: str) -> str:
+def format_results(results):
+    """Human-readable rendering of retrieved chunks, used when tool results are sent as text."""
+    return "\n\n".join(
+        f"[Relevance: {result['score']:.2f}] (already provided earlier as chunk {result['id']})" if result.get('repeat')
+        else f"[Relevance: {result['score']:.2f}] {result['text']}"
+        for result in results
+    )
+
+def pack_results(chunks, tool_context, max_tokens):
+    """Fit the chunks this conversation has not seen yet into the token budget; seen ones become references."""
+    ledger = ChunkLedger(tool_context.agent.state, tool_context.agent.messages)
+    fresh, repeats = ledger.split(chunks)
+    packed, report = pack_context(fresh, max_tokens)
+    ledger.record(packed)
+    return packed + repeats, report
+
+@tool(context=True)
+def retrieve_from_knowledge_base(query: str, tool_context: ToolContext, max_tokens: int = 1500) -> dict:
     """
     Retrieve relevant information from the Bedrock Knowledge Base.
 
     Args:
         query: The search query to find relevant documents
+        max_tokens: Approximate token budget for the returned passages (default: 1500)
 
     Returns:
-        str: Retrieved context from the knowledge base
+        dict: Retrieved passages, best first, and how many tokens were left out to fit the budget
     """
     try:
-        response = bedrock_agent_runtime.retrieve(
-            knowledgeBaseId=KNOWLEDGE_BASE_ID,
-            retrievalQuery={
-                'text': query
-            },
-            retrievalConfiguration={
-                'vectorSearchConfiguration': {
-                    'numberOfResults': 5
-                }
-            }
+        # Served from the cache when an equivalent query ran in the last few minutes
+        results = [to_chunk(result) for result in retriever.retrieve(query)]
+
+        if not results:
+            return tool_result(
+                'retrieve_from_knowledge_base', {'query': query, 'results': []},
+                text="No relevant information found in the knowledge base."
+            )
+
+        # Best chunks first, trimmed to the budget, overlapping chunks of a document merged;
+        # chunks this conversation has already seen are referenced by id instead of repeated
+        results, report = pack_results(results, tool_context, max_tokens)
+
+        return tool_result(
+            'retrieve_from_knowledge_base', {'query': query, 'results': results, **report},
+            text=lambda: format_results(results)
         )
 
-        # Extract and format results
-        results = []
-        for result in response.get('retrievalResults', []):
-            content = result.get('content', {}).get('text', '')
-            score = result.get('score', 0)
-            results.append(f"[Relevance: {score:.2f}] {content}")
+    except Exception as e:
+        message = f"Error retrieving from knowledge base: {str(e)}"
+        return tool_result('retrieve_from_knowledge_base', {'error': message}, text=message, status='error')
+
+@tool(context=True)
+def retrieve_multi_from_knowledge_base(queries: list[str], tool_context: ToolContext, max_tokens: int = 1500) -> dict:
+    """
+    Retrieve information for several phrasings or sub-questions at once and merge the results.
+    Prefer this over repeated retrieve_from_knowledge_base calls for complex questions.
+
+    Args:
+        queries: Sub-queries or reformulations of the question (e.g. ["S3 encryption", "KMS key rotation"])
+        max_tokens: Approximate token budget for the returned passages (default: 1500)
+
+    Returns:
+        dict: The merged passages, best first, and how many tokens were left out to fit the budget
+    """
+    try:
+        # Reformulations that normalize to the same text are retrieved once
+        unique = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), query)
+        unique = list(unique.values())
+
+        # One retrieve call per sub-query, run concurrently, merged by reciprocal-rank fusion
+        results = fuse_results(retriever.retrieve_many(unique))
 
         if not results:
-            return "No relevant information found in the knowledge base."
+            return tool_result(
+                'retrieve_multi_from_knowledge_base', {'queries': unique, 'results': []},
+                text="No relevant information found in the knowledge base."
+            )
 
-        return "\n\n".join(results)
+        results, report = pack_results(results, tool_context, max_tokens)
+
+        return tool_result(
+            'retrieve_multi_from_knowledge_base',
+            {'queries': unique, 'results': results, **report},
+            text=lambda: format_results(results)
+        )
 
     except Exception as e:
-        return f"Error retrieving from knowledge base: {str(e)}"
+        message = f"Error retrieving from knowledge base: {str(e)}"
+        return tool_result('retrieve_multi_from_knowledge_base', {'error': message}, text=message, status='error')
 
 # Initialize Bedrock model
 bedrock_model = BedrockModel(
@@ -68,15 +149,16 @@ bedrock_model = BedrockModel(
     temperature=0.3,
 )
 
-# Create agent with both tools
+# Create agent with all tools
 agent = Agent(
     model=bedrock_model,
-    system_prompt="""You are a helpful assistant with access to two tools:
+    system_prompt="""You are a helpful assistant with access to three tools:
 1. current_time - to get the current date and time
 2. retrieve_from_knowledge_base - to search for information in the knowledge base
+3. retrieve_multi_from_knowledge_base - to search for several sub-questions or phrasings in one call
 
 Use these tools when appropriate to answer user questions accurately.""",
-    tools=[current_time, retrieve_from_knowledge_base]
+    tools=[current_time, retrieve_from_knowledge_base, retrieve_multi_from_knowledge_base]
 )
 
 def main():
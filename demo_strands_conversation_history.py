@@ -1,11 +1,18 @@
 from strands import Agent
-from strands.agent.conversation_manager import SlidingWindowConversationManager
+from history_compactor import HistoryCompactor
+from token_conversation_manager import TokenBudgetConversationManager
 import json
 
-# Create a conversation manager with custom window size
-# By default, SlidingWindowConversationManager is used even if not specified
-conversation_manager = SlidingWindowConversationManager(
-    window_size=10,  # Maximum number of message pairs to keep
+# Create a conversation manager that trims by size rather than message count
+# By default, SlidingWindowConversationManager is used even if not specified;
+# it keeps a fixed number of messages however large they are
+# Large tool results older than 2 turns are swapped for stubs; the model can recall the originals
+compactor = HistoryCompactor(after_turns=2)
+
+conversation_manager = TokenBudgetConversationManager(
+    max_tokens=8000,           # Estimated tokens the message history may use
+    large_result_tokens=500,   # Tool results at least this large are evicted before whole turns
+    compactor=compactor,       # Evicted results are kept by the compactor, not lost
 )
 
 initial_messages = [
@@ -14,7 +21,13 @@ initial_messages = [
 ]
 
 # Use the conversation manager with your agent
-agent = Agent(messages=initial_messages, conversation_manager=conversation_manager)
+# Also registered as hooks, so the budget and compaction are applied before every model call
+agent = Agent(
+    messages=initial_messages,
+    tools=[compactor.recall_tool],
+    conversation_manager=conversation_manager,
+    hooks=[conversation_manager, compactor],
+)
 
 print("\nCall Agent:")
 agent("What is my name?")
@@ -22,4 +35,6 @@ agent("What is my name?")
 # Access the conversation history
 print("\n\nMessge History:")
 #print(agent.messages)  # Shows all messages exchanged so far
-print(json.dumps(agent.messages, indent=2))
\ No newline at end of file
+print(json.dumps(agent.messages, indent=2))
+print(f"\nHistory tokens (estimated): {conversation_manager.total_tokens(agent.messages)}")
+print(f"Compaction: {compactor.report()}")
\ No newline at end of file
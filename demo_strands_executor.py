@@ -25,6 +25,32 @@ from strands.tools.executors import SequentialToolExecutor
 import time
 from datetime import datetime
 
+# Simulated tool work. The defaults reproduce the demo below; the executor
+# benchmark (demo_strands_executor_benchmark.py) rescales them to sweep tool
+# latency, switch to CPU-bound work and pad tool outputs.
+SIMULATED_WORK = {
+    "mode": "sleep",      # "sleep" (I/O-like) or "cpu" (busy loop holding the GIL)
+    "scale": 1.0,         # multiplier applied to every simulated delay
+    "output_bytes": 0,    # extra characters appended to every tool result
+}
+
+
+def simulate_work(seconds: float) -> None:
+    """Spend the given (scaled) time sleeping or spinning, per SIMULATED_WORK"""
+    seconds *= SIMULATED_WORK["scale"]
+    if SIMULATED_WORK["mode"] == "cpu":
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+    else:
+        time.sleep(seconds)
+
+
+def pad_output(text: str) -> str:
+    """Append SIMULATED_WORK["output_bytes"] of filler to a tool result"""
+    return text + "." * SIMULATED_WORK["output_bytes"]
+
+
 # Define mock tools for demonstration
 
 @tool
@@ -39,7 +65,7 @@ def weather_tool(city: str) -> str:
         str: Weather information for the city
     """
     # Simulate API call delay
-    time.sleep(0.5)
+    simulate_work(0.5)
 
     # Mock weather data
     weather_data = {
@@ -49,7 +75,7 @@ def weather_tool(city: str) -> str:
         "Paris": "Partly cloudy, 65°F (18°C)"
     }
 
-    return weather_data.get(city, f"Weather data not available for {city}")
+    return pad_output(weather_data.get(city, f"Weather data not available for {city}"))
 
 
 @tool
@@ -64,11 +90,11 @@ def time_tool(city: str) -> str:
         str: Current time in the city
     """
     # Simulate API call delay
-    time.sleep(0.5)
+    simulate_work(0.5)
 
     # Mock time data (in reality, you'd use timezone conversion)
     current_time = datetime.now().strftime("%I:%M %p")
-    return f"Current time in {city}: {current_time}"
+    return pad_output(f"Current time in {city}: {current_time}")
 
 
 @tool
@@ -80,12 +106,12 @@ def screenshot_tool() -> str:
         str: Confirmation message with screenshot details
     """
     # Simulate screenshot capture delay
-    time.sleep(1)
+    simulate_work(1)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"screenshot_{timestamp}.png"
 
-    return f"Screenshot captured successfully: {filename}"
+    return pad_output(f"Screenshot captured successfully: {filename}")
 
 
 @tool
@@ -103,62 +129,63 @@ def email_tool(recipient: str, subject: str, body: str, attachment: str = None)
         str: Confirmation message
     """
     # Simulate email sending delay
-    time.sleep(1)
+    simulate_work(1)
 
     attachment_info = f" with attachment '{attachment}'" if attachment else ""
-    return f"Email sent to {recipient}{attachment_info}. Subject: '{subject}'"
-
-
-# =============================================================================
-# DEMO 1: Concurrent Execution (Default)
-# =============================================================================
-print("\n" + "="*80)
-print("DEMO 1: CONCURRENT EXECUTION (Default)")
-print("="*80)
-print("\nScenario: Getting weather and time for a city")
-print("These operations are independent and can run in parallel.\n")
-
-# Create agent with concurrent execution (default behavior)
-concurrent_agent = Agent(tools=[weather_tool, time_tool])
-
-start_time = time.time()
-concurrent_agent("What is the weather and time in New York?")
-concurrent_duration = time.time() - start_time
-
-print(f"\n⏱️  Concurrent execution completed in: {concurrent_duration:.2f} seconds")
-print("Note: Both tools ran in parallel, saving time!")
-
-
-# =============================================================================
-# DEMO 2: Sequential Execution
-# =============================================================================
-print("\n" + "="*80)
-print("DEMO 2: SEQUENTIAL EXECUTION")
-print("="*80)
-print("\nScenario: Taking a screenshot and emailing it")
-print("These operations are dependent - we need the screenshot before emailing.\n")
-
-# Create agent with sequential execution
-sequential_agent = Agent(
-    tool_executor=SequentialToolExecutor(),
-    tools=[screenshot_tool, email_tool]
-)
-
-start_time = time.time()
-sequential_agent("Take a screenshot and email it to my friend at friend@example.com with subject 'Check this out'")
-sequential_duration = time.time() - start_time
-
-print(f"\n⏱️  Sequential execution completed in: {sequential_duration:.2f} seconds")
-print("Note: Tools ran one after another, ensuring proper order!")
-
-
-# =============================================================================
-# DEMO 3: Comparison
-# =============================================================================
-print("\n" + "="*80)
-print("EXECUTION STRATEGY COMPARISON")
-print("="*80)
-print(f"""
+    return pad_output(f"Email sent to {recipient}{attachment_info}. Subject: '{subject}'")
+
+
+if __name__ == "__main__":
+    # =============================================================================
+    # DEMO 1: Concurrent Execution (Default)
+    # =============================================================================
+    print("\n" + "="*80)
+    print("DEMO 1: CONCURRENT EXECUTION (Default)")
+    print("="*80)
+    print("\nScenario: Getting weather and time for a city")
+    print("These operations are independent and can run in parallel.\n")
+
+    # Create agent with concurrent execution (default behavior)
+    concurrent_agent = Agent(tools=[weather_tool, time_tool])
+
+    start_time = time.time()
+    concurrent_agent("What is the weather and time in New York?")
+    concurrent_duration = time.time() - start_time
+
+    print(f"\n⏱️  Concurrent execution completed in: {concurrent_duration:.2f} seconds")
+    print("Note: Both tools ran in parallel, saving time!")
+
+
+    # =============================================================================
+    # DEMO 2: Sequential Execution
+    # =============================================================================
+    print("\n" + "="*80)
+    print("DEMO 2: SEQUENTIAL EXECUTION")
+    print("="*80)
+    print("\nScenario: Taking a screenshot and emailing it")
+    print("These operations are dependent - we need the screenshot before emailing.\n")
+
+    # Create agent with sequential execution
+    sequential_agent = Agent(
+        tool_executor=SequentialToolExecutor(),
+        tools=[screenshot_tool, email_tool]
+    )
+
+    start_time = time.time()
+    sequential_agent("Take a screenshot and email it to my friend at friend@example.com with subject 'Check this out'")
+    sequential_duration = time.time() - start_time
+
+    print(f"\n⏱️  Sequential execution completed in: {sequential_duration:.2f} seconds")
+    print("Note: Tools ran one after another, ensuring proper order!")
+
+
+    # =============================================================================
+    # DEMO 3: Comparison
+    # =============================================================================
+    print("\n" + "="*80)
+    print("EXECUTION STRATEGY COMPARISON")
+    print("="*80)
+    print(f"""
 Concurrent Execution:
   ✓ Faster for independent operations
   ✓ Better resource utilization
@@ -176,6 +203,6 @@ Choose based on your use case:
 - Use SEQUENTIAL when one tool's output feeds into another
 """)
 
-print("="*80)
-print("DEMO COMPLETE")
-print("="*80)
\ No newline at end of file
+    print("="*80)
+    print("DEMO COMPLETE")
+    print("="*80)
\ No newline at end of file
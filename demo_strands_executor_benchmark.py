@@ -0,0 +1,252 @@
+"""
+=============================================================================
+STRANDS AGENT DEMO - Tool Executor Benchmark
+=============================================================================
+
+Benchmarks ConcurrentToolExecutor against SequentialToolExecutor across:
+- Tool calls per model turn (1 - 64)
+- Tool latency type: sleep (I/O-like) vs CPU-bound busy loop
+- Tool output size
+
+The tools under test are the weather/time/screenshot/email mocks from
+demo_strands_executor.py, rescaled through its SIMULATED_WORK settings. The
+model is a ScriptedModel (mock_model.py), so no network access is needed and
+all model time is zero - every millisecond measured is tool or executor time.
+
+For each scenario the benchmark reports:
+- Throughput (tool calls per second)
+- p50 / p95 / p99 latency of one agent invocation
+- Peak thread count and peak traced memory
+
+Results are written as JSON and appended to a history file; every run is
+compared with the previous run made with the same settings (--scale,
+--repeats, --quick) and scenarios whose p50 regressed by more than the
+threshold are reported (exit code 1).
+
+Usage:
+    py -3.12 demo_strands_executor_benchmark.py
+    py -3.12 demo_strands_executor_benchmark.py --quick
+    py -3.12 demo_strands_executor_benchmark.py --calls 1 8 64 --modes sleep --repeats 10
+
+=============================================================================
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from strands import Agent
+from strands.tools.executors import ConcurrentToolExecutor, SequentialToolExecutor
+
+import demo_strands_executor as fixtures
+from demo_strands_executor import email_tool, screenshot_tool, time_tool, weather_tool
+from mock_model import ScriptedModel, text_turn, tool_turn
+
+EXECUTORS = {
+    "concurrent": ConcurrentToolExecutor,
+    "sequential": SequentialToolExecutor,
+}
+
+CITIES = ["New York", "London", "Tokyo", "Paris"]
+
+# Cycled through to build a batch of N tool calls from the four fixtures
+TOOL_CALL_TEMPLATES = [
+    lambda i: {"name": "weather_tool", "input": {"city": CITIES[i % len(CITIES)]}},
+    lambda i: {"name": "time_tool", "input": {"city": CITIES[i % len(CITIES)]}},
+    lambda i: {"name": "screenshot_tool", "input": {}},
+    lambda i: {"name": "email_tool", "input": {
+        "recipient": f"user{i}@example.com", "subject": "Benchmark", "body": "Benchmark run"
+    }},
+]
+
+
+def build_script(tool_calls):
+    """One turn issuing tool_calls tool uses, then a closing text turn"""
+    uses = [TOOL_CALL_TEMPLATES[i % len(TOOL_CALL_TEMPLATES)](i) for i in range(tool_calls)]
+    return [tool_turn(*uses), text_turn("All tool calls completed.")]
+
+
+class ThreadSampler:
+    """Background sampler recording the peak number of live threads"""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(executor_name, tool_calls, mode, output_bytes, repeats, scale):
+    """Time repeated agent invocations for one scenario and summarize them"""
+    fixtures.SIMULATED_WORK.update(mode=mode, scale=scale, output_bytes=output_bytes)
+
+    def new_agent():
+        return Agent(
+            model=ScriptedModel(build_script(tool_calls)),
+            tools=[weather_tool, time_tool, screenshot_tool, email_tool],
+            tool_executor=EXECUTORS[executor_name](),
+            callback_handler=None
+        )
+
+    # Warm-up run, also used to measure memory so tracemalloc doesn't skew timings
+    tracemalloc.start()
+    new_agent()("Run the benchmark tools.")
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations = []
+    baseline_threads = threading.active_count()
+    with ThreadSampler() as sampler:
+        for _ in range(repeats):
+            agent = new_agent()
+            start = time.perf_counter()
+            agent("Run the benchmark tools.")
+            durations.append(time.perf_counter() - start)
+
+    total_time = sum(durations)
+    return {
+        "executor": executor_name,
+        "tool_calls": tool_calls,
+        "mode": mode,
+        "output_bytes": output_bytes,
+        "repeats": repeats,
+        "throughput_calls_per_s": tool_calls * repeats / total_time,
+        "p50_s": statistics.median(durations),
+        "p95_s": percentile(durations, 0.95),
+        "p99_s": percentile(durations, 0.99),
+        "extra_threads_peak": sampler.peak - baseline_threads,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def scenario_key(result):
+    return f"{result['executor']}|calls={result['tool_calls']}|mode={result['mode']}|output={result['output_bytes']}"
+
+
+def run_settings(run):
+    """The settings that make two runs' timings comparable"""
+    repeats = run.get("repeats", run["results"][0]["repeats"] if run["results"] else None)
+    return run["scale"], repeats, run.get("quick", False)
+
+
+def load_previous_run(history_path, settings):
+    """Return the most recent run recorded in the history file with the same settings, if any"""
+    if not os.path.exists(history_path):
+        return None
+    previous = None
+    with open(history_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                if run_settings(run) == settings:
+                    previous = run
+    return previous
+
+
+def find_regressions(current, previous, threshold):
+    """Scenarios whose p50 grew by more than threshold (a fraction) since the previous run"""
+    before = {scenario_key(r): r for r in previous["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(scenario_key(result))
+        if old and result["p50_s"] > old["p50_s"] * (1 + threshold):
+            regressions.append((scenario_key(result), old["p50_s"], result["p50_s"]))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark Strands tool executors")
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--modes", nargs="+", choices=["sleep", "cpu"], default=["sleep", "cpu"])
+    parser.add_argument("--output-bytes", type=int, nargs="+", default=[0, 10_000, 100_000])
+    parser.add_argument("--executors", nargs="+", choices=list(EXECUTORS), default=list(EXECUTORS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=0.02,
+                        help="Multiplier for the fixtures' 0.5s/1s simulated delays")
+    parser.add_argument("--output-dir", default="benchmark_results")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="p50 slowdown (fraction) reported as a regression")
+    parser.add_argument("--quick", action="store_true", help="Small sweep for smoke testing")
+    args = parser.parse_args()
+    if args.quick:
+        args.calls, args.output_bytes, args.repeats = [1, 8, 32], [0], 3
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    print("\n" + "="*80)
+    print("TOOL EXECUTOR BENCHMARK")
+    print("="*80)
+    print(f"{'scenario':<58}{'calls/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'threads':>9}{'mem KB':>9}")
+
+    run = {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "scale": args.scale,
+        "repeats": args.repeats,
+        "quick": args.quick,
+        "results": [],
+    }
+    for mode in args.modes:
+        for output_bytes in args.output_bytes:
+            for tool_calls in args.calls:
+                for executor_name in args.executors:
+                    result = run_scenario(executor_name, tool_calls, mode, output_bytes, args.repeats, args.scale)
+                    run["results"].append(result)
+                    print(f"{scenario_key(result):<58}{result['throughput_calls_per_s']:>10.1f}"
+                          f"{result['p50_s']:>9.3f}{result['p95_s']:>9.3f}{result['p99_s']:>9.3f}"
+                          f"{result['extra_threads_peak']:>9}{result['peak_memory_bytes'] // 1024:>9}")
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_path = os.path.join(args.output_dir, f"executor_benchmark_{timestamp}.json")
+    with open(results_path, "w") as f:
+        json.dump(run, f, indent=2)
+
+    history_path = os.path.join(args.output_dir, "executor_benchmark_history.jsonl")
+    previous = load_previous_run(history_path, run_settings(run))
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+
+    print(f"\nResults saved to {results_path}")
+
+    if previous is None:
+        print("No previous run with the same settings to compare against.")
+        sys.exit(0)
+
+    regressions = find_regressions(run, previous, args.threshold)
+    if not regressions:
+        print(f"No regressions against the run from {previous['timestamp']}.")
+        sys.exit(0)
+
+    print(f"\n⚠️  {len(regressions)} regression(s) against the run from {previous['timestamp']}:")
+    for key, old_p50, new_p50 in regressions:
+        print(f"  {key}: p50 {old_p50:.3f}s -> {new_p50:.3f}s ({(new_p50 / old_p50 - 1) * 100:+.0f}%)")
+    sys.exit(1)
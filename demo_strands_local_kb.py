@@ -0,0 +1,98 @@
+"""
+=============================================================================
+STRANDS AGENT DEMO - Local Vector Index as a Knowledge Base Stand-In
+=============================================================================
+
+demo_strands_bedrock_kb.py needs a live Bedrock Knowledge Base, and every
+retrieve call is a network round trip of a few hundred milliseconds. That
+makes the KB tools hard to load-test.
+
+LocalVectorIndex (local_vector_index.py) answers the same retrieve() call
+with the same result shape, entirely in-process:
+- Documents are chunked and embedded into a memory-mapped NumPy matrix
+- An IVF (inverted-file) index narrows each query to a few clusters
+- Retrieval takes well under a millisecond
+
+This demo indexes this repository's documentation and then:
+1. Measures retrieve() latency against the local index
+2. Runs the KB agent's tools against it, offline, with a ScriptedModel
+
+To run demo_strands_bedrock_kb.py itself on the local index:
+    set KB_BACKEND=local
+    set KB_LOCAL_PATH=kb_index
+
+=============================================================================
+"""
+
+import glob
+import os
+import time
+
+from strands import Agent
+
+from kb_retrieval import KnowledgeBaseRetriever
+from local_vector_index import LocalVectorIndex, chunk_text
+from mock_model import ScriptedModel, text_turn, tool_turn
+
+INDEX_PATH = os.environ.get('KB_LOCAL_PATH', 'kb_index')
+
+
+def build_index(path):
+    index = LocalVectorIndex(path)
+    if len(index):
+        print(f"Using existing index at {path}/ ({len(index)} chunks)")
+        return index
+
+    start_time = time.time()
+    for filename in sorted(glob.glob("docs/*.md")) + ["README.md"]:
+        with open(filename, encoding="utf-8") as f:
+            index.add_documents(chunk_text(f.read()), source=f"file://{filename}")
+    print(f"Indexed {len(index)} chunks into {path}/ in {time.time() - start_time:.2f} seconds")
+    return index
+
+
+if __name__ == "__main__":
+    print("\n" + "="*80)
+    print("DEMO 1: RETRIEVE LATENCY")
+    print("="*80 + "\n")
+
+    index = build_index(INDEX_PATH)
+
+    queries = ["callback handler events", "knowledge base retrieval", "install strands agents", "async streaming"]
+    index.retrieve(retrievalQuery={"text": queries[0]})
+
+    calls = 200
+    start_time = time.time()
+    for i in range(calls):
+        index.retrieve(retrievalQuery={"text": queries[i % len(queries)]})
+    duration = time.time() - start_time
+    print(f"⏱️  {calls} retrieve calls: {duration * 1000 / calls:.3f} ms per call")
+
+    for result in index.retrieve(retrievalQuery={"text": "knowledge base retrieval"})["retrievalResults"][:3]:
+        print(f"   [{result['score']:.2f}] {result['location']['s3Location']['uri']}: {result['content']['text'][:60]!r}")
+
+    print("\n" + "="*80)
+    print("DEMO 2: KB TOOLS ON THE LOCAL INDEX (OFFLINE)")
+    print("="*80 + "\n")
+
+    # Importing the KB demo creates a boto3 client, which needs no credentials until it is used
+    import demo_strands_bedrock_kb as kb_demo
+    kb_demo.retriever = KnowledgeBaseRetriever(index, "local")
+
+    agent = Agent(
+        model=ScriptedModel([
+            tool_turn({"name": "retrieve_multi_from_knowledge_base",
+                       "input": {"queries": ["callback handler", "event loop callbacks"], "max_tokens": 400}}),
+            text_turn("Here is what the documentation says about callbacks."),
+        ]),
+        tools=[kb_demo.retrieve_from_knowledge_base, kb_demo.retrieve_multi_from_knowledge_base],
+        callback_handler=None
+    )
+    agent("How do callbacks work?")
+    tool_result = agent.messages[2]["content"][0]["toolResult"]
+    print(f"Tool status: {tool_result['status']}")
+    print(f"Tool result: {str(tool_result['content'][0])[:400]}...")
+
+    print("\n" + "="*80)
+    print("DEMO COMPLETE")
+    print("="*80)
@@ -0,0 +1,156 @@
+"""
+=============================================================================
+STRANDS AGENT DEMO - Offline Benchmarking with a Scripted Model
+=============================================================================
+
+This demo runs the Strands agent loop without any network access by plugging
+a ScriptedModel (mock_model.py) in where a BedrockModel normally goes.
+
+The script replays the same model turns for every prompt:
+- Turn 1: the model calls two tools (weather + time)
+- Turn 2: the model answers with text
+
+Because model latency and token rate come from a seeded RNG, the numbers
+below are reproducible on a laptop or in CI. The demo measures:
+- Agent loop overhead with no model or tool latency at all
+- Concurrent vs sequential tool executor overhead
+- The cost of a printing callback handler vs no callback handler
+- SlidingWindowConversationManager overhead as history grows
+
+Record a live session for replay with RecordingModel:
+    Agent(model=RecordingModel(BedrockModel(...), "session.json"))
+    Agent(model=ScriptedModel.from_recording("session.json"))
+
+=============================================================================
+"""
+
+import statistics
+import time
+
+from strands import Agent, tool
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+from strands.tools.executors import ConcurrentToolExecutor, SequentialToolExecutor
+
+from mock_model import Latency, ScriptedModel, text_turn, tool_turn
+
+
+@tool
+def weather_tool(city: str) -> str:
+    """
+    Get the current weather for a specified city.
+
+    Args:
+        city (str): The name of the city to get weather for
+
+    Returns:
+        str: Weather information for the city
+    """
+    return f"Sunny, 72°F (22°C) in {city}"
+
+
+@tool
+def time_tool(city: str) -> str:
+    """
+    Get the current time for a specified city.
+
+    Args:
+        city (str): The name of the city to get time for
+
+    Returns:
+        str: Current time in the city
+    """
+    return f"Current time in {city}: 10:00 AM"
+
+
+SCRIPT = [
+    tool_turn(
+        {"name": "weather_tool", "input": {"city": "New York"}},
+        {"name": "time_tool", "input": {"city": "New York"}},
+        text="Let me look that up.",
+    ),
+    text_turn("It is sunny and 72°F in New York, and the local time is 10:00 AM."),
+]
+
+PROMPT = "What is the weather and time in New York?"
+
+
+def time_invocations(agent, runs=50):
+    """Invoke the agent repeatedly and return per-invocation durations in milliseconds"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        agent(PROMPT)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label, durations):
+    durations = sorted(durations)
+    p50 = statistics.median(durations)
+    p90 = durations[int(len(durations) * 0.9) - 1]
+    print(f"  {label:<45} p50={p50:7.2f}ms  p90={p90:7.2f}ms")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*80)
+    print("DEMO 1: AGENT LOOP OVERHEAD (zero model latency)")
+    print("="*80)
+
+    for label, executor in [("ConcurrentToolExecutor", ConcurrentToolExecutor()),
+                            ("SequentialToolExecutor", SequentialToolExecutor())]:
+        agent = Agent(
+            model=ScriptedModel(SCRIPT),
+            tools=[weather_tool, time_tool],
+            tool_executor=executor,
+            callback_handler=None
+        )
+        report(label, time_invocations(agent))
+
+    print("\n" + "="*80)
+    print("DEMO 2: CALLBACK HANDLER OVERHEAD (200 tokens/s streaming)")
+    print("="*80)
+
+    def printing_callback(**kwargs):
+        if "data" in kwargs:
+            print(kwargs["data"], end="", flush=True)
+
+    silent = Agent(model=ScriptedModel(SCRIPT, tokens_per_second=200),
+                   tools=[weather_tool, time_tool], callback_handler=None)
+    printing = Agent(model=ScriptedModel(SCRIPT, tokens_per_second=200),
+                     tools=[weather_tool, time_tool], callback_handler=printing_callback)
+    silent_durations = time_invocations(silent, runs=10)
+    printing_durations = time_invocations(printing, runs=10)
+    print()
+    report("callback_handler=None", silent_durations)
+    report("printing callback handler", printing_durations)
+
+    print("\n" + "="*80)
+    print("DEMO 3: CONVERSATION MANAGER OVERHEAD AS HISTORY GROWS")
+    print("="*80)
+
+    for window_size in [10, 40, 1000]:
+        agent = Agent(
+            model=ScriptedModel(SCRIPT),
+            tools=[weather_tool, time_tool],
+            conversation_manager=SlidingWindowConversationManager(window_size=window_size),
+            callback_handler=None
+        )
+        report(f"SlidingWindow(window_size={window_size}), 100 turns", time_invocations(agent, runs=100))
+
+    print("\n" + "="*80)
+    print("DEMO 4: REALISTIC LATENCY (lognormal first token, 60 tokens/s, seed=7)")
+    print("="*80)
+
+    model = ScriptedModel(
+        SCRIPT,
+        tokens_per_second=60,
+        first_token_latency=Latency.lognormal(median=0.4, sigma=0.5),
+        seed=7
+    )
+    agent = Agent(model=model, tools=[weather_tool, time_tool], callback_handler=None)
+    report("ScriptedModel with latency", time_invocations(agent, runs=5))
+    print(f"  Model calls: {model.call_count}")
+
+    print("\n" + "="*80)
+    print("DEMO COMPLETE")
+    print("="*80)
@@ -0,0 +1,134 @@
+"""
+=============================================================================
+STRANDS AGENT DEMO - Process-Pool Execution for CPU-Bound Tools
+=============================================================================
+
+CPU-bound tools (like the sympy-backed calculator, or heavy parsers) hold the
+GIL while they run in the concurrent executor's worker threads, so a batch of
+them runs no faster than one after another - and the streaming callback stalls
+while they compute.
+
+This demo runs the same CPU-heavy tool two ways:
+- As a plain @tool function (runs in a thread, serialized by the GIL)
+- With @run_in_process_pool (process_pool_tools.py), which runs it in a warm
+  pool of worker processes for real multi-core parallelism
+
+It also shows the per-call timeout: a runaway call is abandoned, its worker is
+terminated, and the agent receives an error tool result instead of hanging.
+
+The model is a ScriptedModel (mock_model.py), so the demo runs offline.
+
+=============================================================================
+"""
+
+import os
+import time
+
+from strands import Agent, tool
+
+from mock_model import ScriptedModel, text_turn, tool_turn
+from process_pool_tools import default_pool, run_in_process_pool
+
+
+def _count_primes(limit: int) -> int:
+    count = 0
+    for n in range(2, limit):
+        if all(n % d for d in range(2, int(n ** 0.5) + 1)):
+            count += 1
+    return count
+
+
+@tool
+def count_primes_threaded(limit: int) -> str:
+    """
+    Count the prime numbers below a limit.
+
+    Args:
+        limit (int): Upper bound (exclusive)
+
+    Returns:
+        str: The number of primes below the limit
+    """
+    return f"There are {_count_primes(limit)} primes below {limit}"
+
+
+@tool
+@run_in_process_pool(timeout=30)
+def count_primes(limit: int) -> str:
+    """
+    Count the prime numbers below a limit.
+
+    Args:
+        limit (int): Upper bound (exclusive)
+
+    Returns:
+        str: The number of primes below the limit
+    """
+    return f"There are {_count_primes(limit)} primes below {limit}"
+
+
+@tool
+@run_in_process_pool(timeout=0.5)
+def slow_factorial_digits(n: int) -> str:
+    """
+    Count the digits of n factorial.
+
+    Args:
+        n (int): The number whose factorial to compute
+
+    Returns:
+        str: The number of digits in n!
+    """
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return f"{n}! has {len(str(result))} digits"
+
+
+def run_batch(label, tool_fn, tool_name, calls=4, limit=150_000):
+    script = [
+        tool_turn(*[{"name": tool_name, "input": {"limit": limit + i}} for i in range(calls)]),
+        text_turn("Counted the primes."),
+    ]
+    agent = Agent(model=ScriptedModel(script), tools=[tool_fn], callback_handler=None)
+
+    start_time = time.time()
+    agent("Count the primes below each of these limits.")
+    duration = time.time() - start_time
+
+    print(f"⏱️  {label:<32} {duration:.2f} seconds for {calls} calls")
+    return duration
+
+
+if __name__ == "__main__":
+    print("\n" + "="*80)
+    print(f"DEMO 1: CPU-BOUND TOOL BATCH ({os.cpu_count()} CPUs)")
+    print("="*80 + "\n")
+
+    # Start the worker processes up front so the comparison excludes startup cost
+    default_pool.warm_up()
+
+    threaded = run_batch("Threads (GIL-bound):", count_primes_threaded, "count_primes_threaded")
+    pooled = run_batch("Process pool:", count_primes, "count_primes")
+    print(f"\nSpeed-up from the process pool: {threaded / pooled:.1f}x")
+
+    print("\n" + "="*80)
+    print("DEMO 2: PER-CALL TIMEOUT")
+    print("="*80 + "\n")
+
+    agent = Agent(
+        model=ScriptedModel([
+            tool_turn({"name": "slow_factorial_digits", "input": {"n": 10_000_000}}),
+            text_turn("The calculation timed out."),
+        ]),
+        tools=[slow_factorial_digits],
+        callback_handler=None
+    )
+    agent("How many digits does 10,000,000! have?")
+    tool_result = agent.messages[2]["content"][0]["toolResult"]
+    print(f"Tool status: {tool_result['status']}")
+    print(f"Tool result: {tool_result['content'][0]['text']}")
+
+    print("\n" + "="*80)
+    print("DEMO COMPLETE")
+    print("="*80)
@@ -0,0 +1,218 @@
+"""
+Compaction of old tool results in a Strands agent's conversation history.
+
+A tool result stays in agent.messages for the rest of the session and is sent
+to the model again on every later call, so one 10,000-character article read
+early on is paid for on every turn after it. HistoryCompactor replaces large
+tool results that are more than a few turns old with a short stub:
+
+    [Compacted tool result get_wikipedia_content ref=3f2a9c1b7d4e (10,412 bytes, ~2,603 tokens).
+     Summary: Python is a high-level, general-purpose programming language. ...
+     Call recall_tool_result with this ref for the full result.]
+
+The original content is kept in a ResultStore (an in-memory LRU bounded by
+size) under ref, a hash of the content, and the recall_tool_result tool puts
+it back into the conversation when the model needs it again:
+
+    compactor = HistoryCompactor(after_turns=2)
+    agent = Agent(tools=[..., compactor.recall_tool], hooks=[compactor])
+
+Compaction runs before every model call. The toolUse / toolResult pairs stay
+in place, so the model still sees which calls were made and with which input.
+A TokenBudgetConversationManager given the compactor uses the same stubs when
+it has to evict large results to stay under its budget.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from strands import tool
+from strands.hooks import BeforeModelCallEvent, HookProvider, HookRegistry
+from strands.types.content import Messages
+
+from tool_results import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Characters of the original result kept as the stub's summary
+SUMMARY_CHARS = 300
+
+STUB_PREFIX = "[Compacted tool result"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def result_text(content: list[dict[str, Any]]) -> str:
+    """The text of a toolResult's content blocks (JSON blocks serialized compactly)."""
+    parts = []
+    for block in content:
+        if "text" in block:
+            parts.append(block["text"])
+        elif "json" in block:
+            parts.append(json.dumps(block["json"], ensure_ascii=False, separators=(",", ":"), default=str))
+    return "\n".join(parts)
+
+
+def summarize(text: str, max_chars: int = SUMMARY_CHARS) -> str:
+    """The start of text, cut at a sentence (or failing that, word) boundary."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars]
+    sentences = _SENTENCE_END.split(head)
+    if len(sentences) > 1:
+        return " ".join(sentences[:-1]) + " …"
+    return head.rsplit(" ", 1)[0] + " …"
+
+
+def is_stub(content: list[dict[str, Any]]) -> bool:
+    return len(content) == 1 and content[0].get("text", "").startswith(STUB_PREFIX)
+
+
+class ResultStore:
+    """Thread-safe LRU of original tool-result content, keyed by content hash.
+
+    Args:
+        max_bytes: Total size of stored results before the least recently used is dropped.
+    """
+
+    def __init__(self, max_bytes: int = 50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[list[dict[str, Any]], int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def ref(content: list[dict[str, Any]]) -> str:
+        canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def put(self, content: list[dict[str, Any]], size: int) -> str:
+        ref = self.ref(content)
+        with self._lock:
+            if ref not in self._entries:
+                self._entries[ref] = (content, size)
+                self._size += size
+            self._entries.move_to_end(ref)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._size -= dropped
+        return ref
+
+    def get(self, ref: str) -> Optional[list[dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(ref)
+            if entry is None:
+                return None
+            self._entries.move_to_end(ref)
+            return entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HistoryCompactor(HookProvider):
+    """Replaces old, large tool results in the history with stubs that can be recalled.
+
+    Args:
+        after_turns: Compact a result once this many newer user prompts follow it.
+        min_tokens: Only results at least this large (estimated) are compacted.
+        store: Where originals are kept; defaults to a 50 MB in-memory ResultStore.
+    """
+
+    def __init__(self, after_turns: int = 2, min_tokens: int = 500, store: Optional[ResultStore] = None):
+        self.after_turns = after_turns
+        self.min_tokens = min_tokens
+        self.store = store if store is not None else ResultStore()
+        self.compacted = 0
+        self.tokens_saved = 0
+        self.recall_tool = self._make_recall_tool()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, lambda event: self.compact(event.agent.messages))
+
+    def stub(self, tool_name: str, content: list[dict[str, Any]]) -> Optional[list[dict[str, Any]]]:
+        """Store a result's content and return its stub, or None if it is small or already a stub."""
+        if is_stub(content):
+            return None
+        text = result_text(content)
+        tokens = estimate_tokens(text)
+        if tokens < self.min_tokens:
+            return None
+        size = len(text.encode("utf-8"))
+        ref = self.store.put(content, size)
+        stub = (
+            f"{STUB_PREFIX} {tool_name} ref={ref} ({size:,} bytes, ~{tokens:,} tokens). "
+            f"Summary: {summarize(text)} Call recall_tool_result with this ref for the full result.]"
+        )
+        self.compacted += 1
+        self.tokens_saved += tokens - estimate_tokens(stub)
+        return [{"text": stub}]
+
+    def compact(self, messages: Messages) -> int:
+        """Compact results older than after_turns prompts, in place. Returns the number compacted."""
+        tool_names: dict[str, str] = {}
+        prompts_after = sum(
+            1 for message in messages
+            if message["role"] == "user" and not any("toolResult" in block for block in message["content"])
+        )
+        compacted = 0
+        for message in messages:
+            content = message["content"]
+            if message["role"] == "assistant":
+                tool_names.update(
+                    (block["toolUse"]["toolUseId"], block["toolUse"]["name"]) for block in content if "toolUse" in block
+                )
+                continue
+            if not any("toolResult" in block for block in content):
+                prompts_after -= 1
+                continue
+            if prompts_after < self.after_turns:
+                continue
+
+            blocks, changed = [], False
+            for block in content:
+                result = block.get("toolResult")
+                stub = result and self.stub(tool_names.get(result["toolUseId"], "tool"), result["content"])
+                if stub:
+                    block = {"toolResult": {**result, "content": stub}}
+                    changed = True
+                blocks.append(block)
+            if changed:
+                # A new content list rather than an in-place edit, so cached token counts are invalidated
+                message["content"] = blocks
+                compacted += 1
+
+        if compacted:
+            logger.debug("messages=<%d>, tokens_saved=<%d> | compacted tool results", compacted, self.tokens_saved)
+        return compacted
+
+    def _make_recall_tool(self):
+        store = self.store
+
+        @tool
+        def recall_tool_result(ref: str) -> dict:
+            """
+            Get back the full content of an earlier tool result that was compacted in the conversation.
+
+            Args:
+                ref: The ref shown in the compacted tool result
+
+            Returns:
+                dict: The original tool result
+            """
+            content = store.get(ref)
+            if content is None:
+                message = f"No stored result for ref {ref}; call the original tool again."
+                return {"status": "error", "content": [{"text": message}]}
+            return {"status": "success", "content": content}
+
+        return recall_tool_result
+
+    def report(self) -> dict[str, int]:
+        return {"compacted": self.compacted, "tokens_saved": self.tokens_saved, "stored": len(self.store)}
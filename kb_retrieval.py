@@ -0,0 +1,358 @@
+"""
+Retrieval helpers for the Bedrock Knowledge Base demo (demo_strands_bedrock_kb.py).
+
+KnowledgeBaseRetriever wraps a `bedrock-agent-runtime` client's retrieve()
+call with a query-result cache. Agents often reformulate the same question
+within a session ("AWS security", "aws  security?"), so results are cached
+under the normalized query text, the number of results and the KB ID, with
+a TTL and an LRU bound on the number of entries.
+
+retrieve_many() runs several sub-queries concurrently on a small thread pool
+(the boto3 client is thread-safe and pools its connections), and
+fuse_results() merges their rankings with reciprocal-rank fusion, so a
+question split into reformulations costs one tool call instead of one agent
+cycle per reformulation.
+
+pack_context() fits the best chunks into a token budget, trimming the last
+one to sentence boundaries and merging chunks of the same document, so one
+oversized chunk cannot inflate every later model call.
+
+Chunks that come back again for a later query in the same conversation
+should not be sent to the model twice. ChunkLedger remembers which chunks a
+conversation has already seen (in the agent's state, so it follows the
+session), and split() replaces repeats with a reference.
+
+The client is only used through its retrieve() method, so tests can pass a
+stub instead of a boto3 client:
+
+    class StubClient:
+        def retrieve(self, **kwargs):
+            return {"retrievalResults": [{"content": {"text": "..."}, "score": 0.9}]}
+
+    retriever = KnowledgeBaseRetriever(StubClient(), "KB123")
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from tool_results import CHARS_PER_TOKEN, estimate_tokens
+
+# Sub-queries retrieved at once by retrieve_many(); keep at or below the client's max_pool_connections
+MAX_PARALLEL_QUERIES = 8
+# Reciprocal-rank fusion constant: larger values flatten the advantage of top ranks
+RRF_K = 60
+
+# Smallest remaining budget worth filling with a trimmed chunk
+MIN_TRIMMED_TOKENS = 40
+# Overlap (in characters) looked for when merging consecutive chunks of one document
+MIN_CHUNK_OVERLAP = 20
+MAX_CHUNK_OVERLAP = 400
+
+# Agent state key holding the ids of chunks already sent in a conversation
+SEEN_CHUNKS_KEY = "kb_seen_chunks"
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: case folded, punctuation dropped, whitespace collapsed."""
+    return " ".join(_PUNCTUATION.sub(" ", query.casefold()).split())
+
+
+def chunk_id(result: dict[str, Any]) -> str:
+    """Stable short id for a retrieved chunk, derived from its text."""
+    text = result.get("content", {}).get("text", "")
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:12]
+
+
+def to_chunk(result: dict[str, Any]) -> dict[str, Any]:
+    """Compact form of a retrievalResults entry: id, score, text and source URI."""
+    return {
+        "id": chunk_id(result),
+        "score": round(result.get("score", 0), 3),
+        "text": result.get("content", {}).get("text", ""),
+        "source": result.get("location", {}).get("s3Location", {}).get("uri"),
+    }
+
+
+@dataclass
+class RetrievalStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class RetrievalCache:
+    """Thread-safe LRU of retrieve() results with a per-entry TTL.
+
+    Args:
+        ttl: Seconds a result stays valid.
+        max_entries: Number of results kept before the least recently used is evicted.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = RetrievalStats()
+        self._entries: "OrderedDict[tuple, tuple[float, list]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[list[dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry[0]:
+                del self._entries[key]
+                self.stats.expired += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, results: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class KnowledgeBaseRetriever:
+    """Cached retrieve() calls against one knowledge base.
+
+    Args:
+        client: A bedrock-agent-runtime client, or anything with the same retrieve() method.
+        knowledge_base_id: The knowledge base to query.
+        number_of_results: Default number of chunks per query.
+        cache: Result cache; defaults to a 5-minute, 256-entry cache.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        knowledge_base_id: str,
+        number_of_results: int = 5,
+        cache: Optional[RetrievalCache] = None,
+    ):
+        self.client = client
+        self.knowledge_base_id = knowledge_base_id
+        self.number_of_results = number_of_results
+        self.cache = cache if cache is not None else RetrievalCache()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def retrieve(self, query: str, number_of_results: Optional[int] = None) -> list[dict[str, Any]]:
+        """Return the retrievalResults for a query, from the cache when an equivalent query was recent."""
+        number_of_results = number_of_results or self.number_of_results
+        key = (self.knowledge_base_id, number_of_results, normalize_query(query))
+
+        results = self.cache.get(key)
+        if results is None:
+            response = self.client.retrieve(
+                knowledgeBaseId=self.knowledge_base_id,
+                retrievalQuery={"text": query},
+                retrievalConfiguration={"vectorSearchConfiguration": {"numberOfResults": number_of_results}},
+            )
+            results = response.get("retrievalResults", [])
+            self.cache.set(key, results)
+        return results
+
+    def retrieve_many(self, queries: list[str], number_of_results: Optional[int] = None) -> list[list[dict[str, Any]]]:
+        """Retrieve several queries concurrently; returns one result list per query, in order."""
+        if len(queries) <= 1:
+            return [self.retrieve(query, number_of_results) for query in queries]
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_QUERIES, thread_name_prefix="kb-retrieve")
+        return list(self._pool.map(lambda query: self.retrieve(query, number_of_results), queries))
+
+
+def fuse_results(result_lists: list[list[dict[str, Any]]], k: int = RRF_K) -> list[dict[str, Any]]:
+    """Merge several ranked retrievalResults lists into one list of chunks.
+
+    Chunks are ordered by reciprocal-rank fusion (the sum of 1 / (k + rank) over the lists
+    they appear in), so a chunk that several sub-queries agree on outranks one that a
+    single query scored highly. Each chunk's score is its best min-max normalized score
+    across the lists, since raw scores from different queries are not comparable.
+    """
+    fused: dict[str, dict[str, Any]] = {}
+    for results in result_lists:
+        scores = [result.get("score", 0) for result in results]
+        low, high = (min(scores), max(scores)) if scores else (0, 0)
+        for rank, result in enumerate(results, 1):
+            chunk = to_chunk(result)
+            normalized = (result.get("score", 0) - low) / (high - low) if high > low else 1.0
+            entry = fused.setdefault(chunk["id"], {**chunk, "score": 0.0, "rrf": 0.0})
+            entry["rrf"] += 1 / (k + rank)
+            entry["score"] = max(entry["score"], round(normalized, 3))
+
+    ranked = sorted(fused.values(), key=lambda chunk: (chunk["rrf"], chunk["score"]), reverse=True)
+    for chunk in ranked:
+        chunk["rrf"] = round(chunk["rrf"], 4)
+    return ranked
+
+
+def _sentences(text: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest run of whole leading sentences of text that fits in max_tokens (at least a cut-down first one)."""
+    kept, used = [], 0
+    for sentence in _sentences(text):
+        tokens = estimate_tokens(sentence + " ")
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+    # Not even one sentence fits: cut at a word boundary
+    cut = text[:max_tokens * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def _merge_text(first: str, second: str) -> Optional[str]:
+    """Join two passages of one document on the text they overlap on (chunks are cut with overlap).
+
+    Returns None if neither contains the other and neither ends where the other begins.
+    """
+    if second in first:
+        return first
+    if first in second:
+        return second
+    for a, b in ((first, second), (second, first)):
+        for size in range(min(len(a), len(b), MAX_CHUNK_OVERLAP), MIN_CHUNK_OVERLAP - 1, -1):
+            if a.endswith(b[:size]):
+                return a + b[size:]
+    return None
+
+
+def pack_context(chunks: list[dict[str, Any]], max_tokens: int) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Fit the best chunks into a token budget.
+
+    chunks are taken best first. Each is counted in (estimated) tokens and kept whole if it
+    fits; the first one that does not fit is trimmed to whole sentences to fill the rest of
+    the budget, and the remainder are dropped. A kept chunk that overlaps an earlier passage
+    from the same source document is then merged into it (overlapping text removed), in the
+    position of the best chunk; chunks that do not overlap stay separate passages, as does
+    the trimmed one.
+
+    Returns:
+        The packed passages, and a report of tokens used, tokens dropped and chunks trimmed.
+    """
+    kept, used, dropped, trimmed = [], 0, 0, 0
+    for chunk in chunks:
+        tokens = estimate_tokens(chunk["text"])
+        remaining = max_tokens - used
+        if tokens <= remaining:
+            kept.append(dict(chunk))
+            used += tokens
+        elif remaining >= MIN_TRIMMED_TOKENS:
+            text = trim_to_tokens(chunk["text"], remaining)
+            kept.append({**chunk, "text": text, "trimmed": True})
+            used += estimate_tokens(text)
+            dropped += tokens - estimate_tokens(text)
+            trimmed += 1
+        else:
+            dropped += tokens
+
+    passages: list[dict[str, Any]] = []
+    by_source: dict[str, list[dict[str, Any]]] = {}
+    for chunk in kept:
+        source = chunk.get("source")
+        candidates = by_source.setdefault(source, []) if source and not chunk.get("trimmed") else []
+        for passage in candidates:
+            merged = _merge_text(passage["text"], chunk["text"])
+            if merged is not None:
+                passage["text"] = merged
+                passage["merged_ids"] = passage.get("merged_ids", []) + [chunk["id"]]
+                break
+        else:
+            passages.append(chunk)
+            if source and not chunk.get("trimmed"):
+                candidates.append(chunk)
+
+    used = sum(estimate_tokens(passage["text"]) for passage in passages)
+    return passages, {"used_tokens": used, "dropped_tokens": dropped, "trimmed_chunks": trimmed}
+
+
+def _result_strings(value: Any):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _result_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _result_strings(item)
+
+
+def history_text(messages: list[dict[str, Any]]) -> str:
+    """The text of all tool results in a message history (JSON blocks included), whitespace collapsed."""
+    parts = []
+    for message in messages:
+        for block in message.get("content", []):
+            if "toolResult" in block:
+                parts.extend(_result_strings(block["toolResult"].get("content", [])))
+    return " ".join(" ".join(parts).split())
+
+
+class ChunkLedger:
+    """The chunk ids already sent to the model in one conversation, kept in the agent's state.
+
+    A chunk only counts as seen while its text is still in the message history: once conversation
+    management drops, evicts, compacts or summarizes the tool result that carried it, the next
+    retrieval sends the text again rather than a reference the model can no longer resolve.
+    """
+
+    def __init__(self, state: Any, messages: list[dict[str, Any]]):
+        self.state = state
+        self.messages = messages
+        self.seen = set(state.get(SEEN_CHUNKS_KEY) or [])
+
+    def split(self, chunks: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Separate chunks not yet sent in this conversation (or no longer in it) from references to the rest."""
+        fresh, repeats = [], []
+        history = history_text(self.messages) if self.seen & {chunk["id"] for chunk in chunks} else ""
+        for chunk in chunks:
+            if chunk["id"] in self.seen and " ".join(chunk["text"].split()) in history:
+                repeats.append({"id": chunk["id"], "score": chunk["score"], "source": chunk.get("source"),
+                                "repeat": True})
+            else:
+                self.seen.discard(chunk["id"])
+                fresh.append(chunk)
+        return fresh, repeats
+
+    def record(self, passages: list[dict[str, Any]]) -> None:
+        """Remember the chunks (including merged ones) that were sent to the model in full.
+
+        A trimmed chunk is not recorded, so a later retrieval can still return the part that was cut off.
+        """
+        for passage in passages:
+            if passage.get("trimmed"):
+                continue
+            self.seen.add(passage["id"])
+            self.seen.update(passage.get("merged_ids", []))
+        self.state.set(SEEN_CHUNKS_KEY, sorted(self.seen))
@@ -0,0 +1,309 @@
+"""
+In-process stand-in for a Bedrock Knowledge Base.
+
+LocalVectorIndex answers the same retrieve() call as a `bedrock-agent-runtime`
+client and returns the same result shape (retrievalResults, content.text,
+score, location.s3Location.uri), so it can be passed wherever the KB tool
+expects a client:
+
+    index = LocalVectorIndex("kb_index")            # or LocalVectorIndex() for memory only
+    index.add_documents(chunk_text(text), source="s3://docs/guide.md")
+    retriever = KnowledgeBaseRetriever(index, "local")
+
+Load tests and latency-sensitive runs can then retrieve in-process in well
+under a millisecond instead of paying a network round trip per query.
+
+- Embeddings are L2-normalized float32 rows in a NumPy matrix. With a path
+  the matrix is a memory-mapped .npy file, grown by doubling, so a large index
+  is paged in on demand instead of loaded; texts and sources live next to it
+  in a JSONL file.
+- Search uses an inverted-file (IVF) index: spherical k-means partitions the
+  rows into about sqrt(n) lists, and a query scores only the rows in the
+  n_probe lists whose centroids are closest. Small indexes are searched
+  exhaustively. Cosine scores are computed for a whole batch of queries with
+  one matrix product.
+- Training reorders the rows so every list is a contiguous block of the
+  matrix, and a query scores its probed lists as slices with no gathering.
+- Documents can be added at any time. New rows are appended after the lists
+  and scanned exhaustively until the index has grown by a quarter, when the
+  lists are retrained.
+
+The default embedder is a dependency-free hashing embedder (word unigrams and
+bigrams hashed into a fixed number of dimensions). It is fast and
+deterministic but only lexical; pass embed= to use a real embedding model
+(e.g. Titan Embeddings through Bedrock) for semantic search.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_DIMENSIONS = 512
+# Indexes smaller than this are searched exhaustively
+MIN_IVF_ROWS = 2_000
+# Retrain the IVF lists once the index has grown by this factor since the last training;
+# rows added in between are scanned exhaustively
+RETRAIN_GROWTH = 1.25
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 50_000
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Embed texts by hashing their words and word pairs into a fixed-size, L2-normalized vector.
+
+    Args:
+        dimensions: Length of the embedding vectors.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD.findall(text.casefold())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # The high bit picks the sign, so colliding features tend to cancel rather than add up
+                vectors[row, digest % self.dimensions] += 1.0 if digest & 0x80000000 else -1.0
+        # Sublinear term frequency, so one repeated word does not dominate a chunk
+        return _normalize(np.sign(vectors) * np.log1p(np.abs(vectors)))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def chunk_text(text: str, max_chars: int = 1200) -> list[str]:
+    """Split text into chunks of at most max_chars, breaking between paragraphs, then lines, where possible."""
+    pieces = []
+    for paragraph in (p.strip() for p in re.split(r"\n\s*\n", text)):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            pieces.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+
+    chunks, current = [], ""
+    for piece in (piece.strip() for piece in pieces):
+        if not piece:
+            continue
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _spherical_kmeans(vectors: np.ndarray, k: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_SAMPLE:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_SAMPLE, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = ~sums.any(axis=1)
+        # Reseed empty lists with random rows so every list stays in use
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class LocalVectorIndex:
+    """A retrieve()-compatible vector index over locally ingested documents.
+
+    Args:
+        path: Directory for the memory-mapped embeddings and documents; None keeps everything in memory.
+        embed: Function mapping a list of texts to an (n, dimensions) array; defaults to HashingEmbedder.
+        dimensions: Embedding size, when using the default embedder.
+        n_probe: IVF lists searched per query; higher is more accurate and slower.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        embed: Optional[Callable[[Sequence[str]], np.ndarray]] = None,
+        dimensions: int = DEFAULT_DIMENSIONS,
+        n_probe: int = 8,
+    ):
+        self.path = path
+        self.embed = embed or HashingEmbedder(dimensions)
+        self.dimensions = dimensions
+        self.n_probe = n_probe
+        self.documents: list[dict[str, Any]] = []
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        # Matrix row i holds the embedding of documents[_row_ids[i]]; training reorders the rows
+        self._row_ids = np.zeros(0, dtype=np.int64)
+        self._centroids: Optional[np.ndarray] = None
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    # --- storage -----------------------------------------------------------
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.path, "embeddings.npy")
+
+    @property
+    def _documents_path(self) -> str:
+        return os.path.join(self.path, "documents.jsonl")
+
+    @property
+    def _row_ids_path(self) -> str:
+        return os.path.join(self.path, "row_ids.npy")
+
+    def _load(self) -> None:
+        if os.path.exists(self._documents_path):
+            with open(self._documents_path, encoding="utf-8") as f:
+                self.documents = [json.loads(line) for line in f if line.strip()]
+        if os.path.exists(self._matrix_path):
+            self._matrix = np.load(self._matrix_path, mmap_mode="r+")
+            self.dimensions = self._matrix.shape[1]
+        else:
+            self._matrix = self._allocate(1024)
+        # Rows appended since the last training are still in document order
+        row_ids = np.load(self._row_ids_path) if os.path.exists(self._row_ids_path) else np.zeros(0, dtype=np.int64)
+        self._row_ids = np.concatenate([row_ids, np.arange(len(row_ids), len(self.documents))])
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.path is None:
+            return np.zeros((capacity, self.dimensions), dtype=np.float32)
+        return np.lib.format.open_memmap(
+            self._matrix_path, mode="w+", dtype=np.float32, shape=(capacity, self.dimensions)
+        )
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(1024, len(self._matrix))
+        while capacity < needed:
+            capacity *= 2
+        if capacity == len(self._matrix):
+            return
+        old = np.array(self._matrix[:len(self.documents)])
+        if self.path is not None:
+            # Release the old mapping before the file is replaced
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            self._matrix = None
+        self._matrix = self._allocate(capacity)
+        self._matrix[:len(old)] = old
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    # --- ingestion ---------------------------------------------------------
+
+    def add_documents(
+        self,
+        texts: Sequence[str],
+        source: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        batch_size: int = 256,
+    ) -> None:
+        """Embed and append chunks of text; they are searchable as soon as this returns."""
+        for start in range(0, len(texts), batch_size):
+            batch = list(texts[start:start + batch_size])
+            vectors = _normalize(np.asarray(self.embed(batch), dtype=np.float32))
+            with self._lock:
+                first = len(self.documents)
+                self._grow(first + len(batch))
+                self._matrix[first:first + len(batch)] = vectors
+                self._row_ids = np.concatenate([self._row_ids, np.arange(first, first + len(batch))])
+                records = [{"text": text, "source": source, "metadata": metadata or {}} for text in batch]
+                self.documents.extend(records)
+                if self.path is not None:
+                    self._matrix.flush()
+                    with open(self._documents_path, "a", encoding="utf-8") as f:
+                        f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def train(self) -> None:
+        """(Re)build the IVF lists over every ingested row.
+
+        Rows are reordered so each list is a contiguous block of the matrix, which lets a query
+        score its probed lists as plain slices instead of gathering scattered rows.
+        """
+        with self._lock:
+            count = len(self.documents)
+            vectors = np.array(self._matrix[:count])
+            k = max(1, int(np.sqrt(count)))
+            self._centroids = _spherical_kmeans(vectors, k)
+            assignments = np.argmax(vectors @ self._centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            self._matrix[:count] = vectors[order]
+            self._row_ids = self._row_ids[order]
+            self._bounds = np.searchsorted(assignments[order], np.arange(k + 1))
+            self._trained_size = count
+            if self.path is not None:
+                self._matrix.flush()
+                np.save(self._row_ids_path, self._row_ids)
+
+    # --- search ------------------------------------------------------------
+
+    def search(self, queries: Sequence[str], k: int = 5) -> list[list[tuple[int, float]]]:
+        """Top-k (document index, cosine score) pairs for each query, best first."""
+        query_vectors = _normalize(np.asarray(self.embed(list(queries)), dtype=np.float32))
+        with self._lock:
+            count = len(self.documents)
+            if count == 0:
+                return [[] for _ in queries]
+            if count < MIN_IVF_ROWS:
+                scores = query_vectors @ self._matrix[:count].T
+                return [self._top_k(row_scores, np.arange(count), k) for row_scores in scores]
+            if self._centroids is None or count >= self._trained_size * RETRAIN_GROWTH:
+                self.train()
+
+            probes = np.argsort(-(query_vectors @ self._centroids.T), axis=1)[:, :self.n_probe]
+            results = []
+            for query_vector, lists in zip(query_vectors, probes):
+                # Probed lists plus the rows added since training, which belong to no list yet
+                ranges = [(self._bounds[i], self._bounds[i + 1]) for i in lists]
+                ranges.append((self._trained_size, count))
+                scores = np.concatenate([self._matrix[start:stop] @ query_vector for start, stop in ranges])
+                positions = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+                results.append(self._top_k(scores, positions, k))
+            return results
+
+    def _top_k(self, scores: np.ndarray, positions: np.ndarray, k: int) -> list[tuple[int, float]]:
+        if len(scores) > k:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best])]
+        return [(int(self._row_ids[positions[i]]), float(scores[i])) for i in best]
+
+    def retrieve(
+        self,
+        knowledgeBaseId: Optional[str] = None,
+        retrievalQuery: Optional[dict[str, Any]] = None,
+        retrievalConfiguration: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Same call and response shape as bedrock-agent-runtime's retrieve()."""
+        k = (retrievalConfiguration or {}).get("vectorSearchConfiguration", {}).get("numberOfResults", 5)
+        hits = self.search([(retrievalQuery or {}).get("text", "")], k)[0]
+        results = []
+        for row, score in hits:
+            document = self.documents[row]
+            result = {"content": {"text": document["text"]}, "score": score, "metadata": document["metadata"]}
+            if document["source"]:
+                result["location"] = {"type": "S3", "s3Location": {"uri": document["source"]}}
+            results.append(result)
+        return {"retrievalResults": results}
+
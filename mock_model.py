@@ -0,0 +1,267 @@
+"""
+Scripted, offline model provider for benchmarking the Strands agent loop.
+
+ScriptedModel plugs in wherever a BedrockModel goes and replays a script of
+model turns - plain text, tool calls, or raw stream events recorded from a live
+model with RecordingModel. Token rate and first-token latency are configurable
+and drawn from a seeded RNG, so executor, callback and conversation-manager
+overhead can be measured reproducibly without a network.
+
+Each agent invocation replays the script from the top: the turn played is the
+number of assistant messages since the latest user prompt, so one ScriptedModel
+can be shared by many agents running concurrently.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from strands.models import Model
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolChoice, ToolSpec
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class Latency:
+    """A latency distribution in seconds, sampled from a caller-supplied RNG."""
+
+    def __init__(self, sampler: Callable[[random.Random], float]):
+        self._sampler = sampler
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, self._sampler(rng))
+
+    @classmethod
+    def constant(cls, seconds: float) -> "Latency":
+        return cls(lambda rng: seconds)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "Latency":
+        return cls(lambda rng: rng.uniform(low, high))
+
+    @classmethod
+    def normal(cls, mean: float, stddev: float) -> "Latency":
+        return cls(lambda rng: rng.gauss(mean, stddev))
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "Latency":
+        """Long-tailed latency, the usual shape of real model time-to-first-token."""
+        return cls(lambda rng: rng.lognormvariate(math.log(median), sigma))
+
+
+def text_turn(text: str) -> dict[str, Any]:
+    """A scripted turn where the model answers with text and ends its turn."""
+    return {"text": text}
+
+
+def output_turn(output: dict[str, Any]) -> dict[str, Any]:
+    """A scripted turn answering a structured_output call with the given fields."""
+    return {"output": output}
+
+
+def tool_turn(*tool_uses: dict[str, Any], text: str = "") -> dict[str, Any]:
+    """A scripted turn where the model calls tools, e.g. tool_turn({"name": "weather", "input": {...}})."""
+    return {"text": text, "tool_uses": list(tool_uses)}
+
+
+def _estimate_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value, default=str)) // 4)
+
+
+def _split_tokens(text: str) -> list[str]:
+    """Split text into word-sized chunks, keeping whitespace attached so chunks rejoin exactly."""
+    chunks: list[str] = []
+    current = ""
+    for char in text:
+        current += char
+        if char.isspace():
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ScriptedModel(Model):
+    """Model provider that replays a scripted conversation instead of calling a service.
+
+    Args:
+        script: Model turns, in the order they are played within one agent invocation.
+            Each turn is a dict with optional "text" and "tool_uses" keys (see text_turn and
+            tool_turn), or {"events": [...]} holding raw stream events recorded by RecordingModel.
+            structured_output() plays the turn's "output" dict (see output_turn), or its text
+            parsed as JSON, validated into the requested model.
+        tokens_per_second: Streaming rate for text and tool input chunks; None streams instantly.
+        first_token_latency: Delay before the first chunk of each turn.
+        seed: Seed for the latency RNG, making runs repeatable.
+        final_text: Text played once the script is exhausted, so a runaway agent loop still ends.
+    """
+
+    def __init__(
+        self,
+        script: list[dict[str, Any]],
+        tokens_per_second: Optional[float] = None,
+        first_token_latency: Optional[Latency] = None,
+        seed: int = 0,
+        final_text: str = "Done.",
+        **model_config: Any,
+    ):
+        self.script = script
+        self.tokens_per_second = tokens_per_second
+        self.first_token_latency = first_token_latency or Latency.constant(0.0)
+        self.final_text = final_text
+        self.rng = random.Random(seed)
+        self.config: dict[str, Any] = {"model_id": "scripted", **model_config}
+        self.call_count = 0
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs: Any) -> "ScriptedModel":
+        """Load a script saved by RecordingModel."""
+        with open(path, "r", encoding="utf-8") as f:
+            turns = json.load(f)
+        return cls([{"events": events} for events in turns], **kwargs)
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict[str, Any]:
+        return self.config
+
+    @staticmethod
+    def turn_index(messages: Messages) -> int:
+        """Number of assistant turns taken since the latest user prompt (not counting tool results)."""
+        index = 0
+        for message in reversed(messages):
+            if message["role"] == "assistant":
+                index += 1
+            elif not any("toolResult" in block for block in message["content"]):
+                break
+        return index
+
+    async def structured_output(
+        self, output_model: Type[T], prompt: Messages, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> AsyncGenerator[dict[str, Union[T, Any]], None]:
+        """Play the scripted turn's "output" (or its text, parsed as JSON), validated into output_model."""
+        self.call_count += 1
+        index = self.turn_index(prompt)
+        turn = self.script[index] if index < len(self.script) else text_turn(self.final_text)
+        await asyncio.sleep(self.first_token_latency.sample(self.rng))
+        data = turn["output"] if "output" in turn else json.loads(turn.get("text", ""))
+        yield {"output": output_model.model_validate(data)}
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: Optional[list[ToolSpec]] = None,
+        system_prompt: Optional[str] = None,
+        *,
+        tool_choice: ToolChoice | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        self.call_count += 1
+        index = self.turn_index(messages)
+        turn = self.script[index] if index < len(self.script) else text_turn(self.final_text)
+        started = time.perf_counter()
+
+        await asyncio.sleep(self.first_token_latency.sample(self.rng))
+
+        if "events" in turn:
+            async for event in self._replay(turn["events"]):
+                yield event
+            return
+
+        output_tokens = 0
+        yield {"messageStart": {"role": "assistant"}}
+
+        if turn.get("text"):
+            yield {"contentBlockStart": {"start": {}}}
+            for chunk in _split_tokens(turn["text"]):
+                await self._pace()
+                output_tokens += 1
+                yield {"contentBlockDelta": {"delta": {"text": chunk}}}
+            yield {"contentBlockStop": {}}
+
+        tool_uses = turn.get("tool_uses", [])
+        for position, tool_use in enumerate(tool_uses):
+            tool_use_id = tool_use.get("toolUseId", f"tooluse_{self.call_count}_{position}")
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use_id, "name": tool_use["name"]}}}}
+            for chunk in _split_tokens(json.dumps(tool_use.get("input", {}))):
+                await self._pace()
+                output_tokens += 1
+                yield {"contentBlockDelta": {"delta": {"toolUse": {"input": chunk}}}}
+            yield {"contentBlockStop": {}}
+
+        yield {"messageStop": {"stopReason": "tool_use" if tool_uses else "end_turn"}}
+
+        input_tokens = _estimate_tokens(messages) + (_estimate_tokens(system_prompt) if system_prompt else 0)
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                },
+                "metrics": {"latencyMs": int((time.perf_counter() - started) * 1000)},
+            }
+        }
+
+    async def _replay(self, events: list[StreamEvent]) -> AsyncIterable[StreamEvent]:
+        for event in events:
+            if "contentBlockDelta" in event:
+                await self._pace()
+            yield event
+
+    async def _pace(self) -> None:
+        if self.tokens_per_second:
+            await asyncio.sleep(1.0 / self.tokens_per_second)
+
+
+class RecordingModel(Model):
+    """Wraps a live model and saves every streamed turn, for later replay by ScriptedModel.from_recording.
+
+    Args:
+        model: The model to record, e.g. a BedrockModel.
+        path: JSON file the recorded turns are written to after each turn.
+    """
+
+    def __init__(self, model: Model, path: str):
+        self.model = model
+        self.path = path
+        self.turns: list[list[StreamEvent]] = []
+
+    def update_config(self, **model_config: Any) -> None:
+        self.model.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.model.get_config()
+
+    def structured_output(
+        self, output_model: Type[T], prompt: Messages, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> AsyncGenerator[dict[str, Union[T, Any]], None]:
+        return self.model.structured_output(output_model, prompt, system_prompt, **kwargs)
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: Optional[list[ToolSpec]] = None,
+        system_prompt: Optional[str] = None,
+        *,
+        tool_choice: ToolChoice | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[StreamEvent]:
+        events: list[StreamEvent] = []
+        async for event in self.model.stream(
+            messages, tool_specs, system_prompt, tool_choice=tool_choice, **kwargs
+        ):
+            events.append(event)
+            yield event
+
+        self.turns.append(events)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.turns, f, indent=2)
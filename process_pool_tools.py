@@ -0,0 +1,208 @@
+"""
+Process-pool execution for CPU-bound Strands tools.
+
+Strands runs synchronous @tool functions in worker threads. A CPU-bound tool
+(symbolic math, heavy parsing) holds the GIL there and stalls every other tool
+in the batch as well as the streaming callback. Opting a tool into
+run_in_process_pool moves its body into a warm pool of worker processes:
+
+    @tool
+    @run_in_process_pool(timeout=30)
+    def solve(expression: str) -> str:
+        ...
+
+The decorated function becomes a coroutine, so the agent's event loop awaits
+the result instead of blocking a thread. Arguments are pickled and checked
+before submission, and each call is bounded by a timeout. A call that times
+out or is cancelled while running is abandoned: its pool is replaced for new
+calls and terminated as soon as the other calls running in it have finished,
+so a runaway computation does not keep a core busy or fail its neighbours.
+
+Workers use the "spawn" start method on every platform: it is safe to start
+from the agent's threads, and behaves the same on Windows, macOS and Linux.
+Tool functions must therefore be defined at module level.
+"""
+
+import asyncio
+import atexit
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Functions opted into the pool, keyed by (module, qualname). Populated at
+# import time in the parent and, on import of the same module, in every worker.
+_REGISTRY: dict[tuple[str, str], Callable[..., Any]] = {}
+
+
+def _registry_key(func: Callable[..., Any]) -> tuple[str, str]:
+    # Under "spawn" the main script is re-imported in workers as __mp_main__
+    module = "__main__" if func.__module__ == "__mp_main__" else func.__module__
+    return module, func.__qualname__
+
+
+def _invoke(key: tuple[str, str], args: tuple, kwargs: dict) -> Any:
+    """Worker-side entry point: look up the registered function and call it."""
+    func = _REGISTRY.get(key)
+    if func is None and key[0] != "__main__":
+        importlib.import_module(key[0])
+        func = _REGISTRY.get(key)
+    if func is None:
+        raise LookupError(f"{key[0]}.{key[1]} is not registered with run_in_process_pool in this worker")
+    return func(*args, **kwargs)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class _Generation:
+    """One ProcessPoolExecutor and the calls submitted to it."""
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+        self.running: set[Future] = set()
+        self.abandoned: set[Future] = set()
+        self.retired = False
+        self.terminated = False
+
+
+class WarmProcessPool:
+    """A lazily started, restartable process pool shared by process-pool tools.
+
+    ProcessPoolExecutor cannot stop a single running call, and terminating one
+    of its workers breaks every other call in the pool. So when a call times
+    out, the pool is retired instead: new calls go to a fresh pool straight
+    away, the other calls already running in the old one finish normally, and
+    once only abandoned calls are left the old pool's processes are terminated.
+
+    Args:
+        max_workers: Number of worker processes; defaults to the CPU count.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._generation: Optional[_Generation] = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Generation:
+        with self._lock:
+            if self._generation is None:
+                self._generation = _Generation(ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                ))
+            return self._generation
+
+    def executor(self) -> ProcessPoolExecutor:
+        return self._current().executor
+
+    def warm_up(self) -> None:
+        """Start every worker process now instead of on the first tool call."""
+        executor = self.executor()
+        for future in [executor.submit(_noop) for _ in range(self.max_workers)]:
+            future.result()
+
+    def restart(self) -> None:
+        """Terminate all workers now, failing any calls still running in them."""
+        with self._lock:
+            generation, self._generation = self._generation, None
+        if generation is not None:
+            generation.retired = True
+            self._terminate(generation)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            generation, self._generation = self._generation, None
+        if generation is not None:
+            generation.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], args: tuple, kwargs: dict, timeout: Optional[float]) -> Any:
+        """Run a registered function in the pool and await its result."""
+        try:
+            pickle.dumps((args, kwargs))
+        except Exception as e:
+            raise TypeError(f"Arguments to {func.__name__} cannot be sent to a worker process: {e}") from e
+
+        generation = self._current()
+        future = generation.executor.submit(_invoke, _registry_key(func), args, kwargs)
+        with self._lock:
+            generation.running.add(future)
+        future.add_done_callback(lambda done: self._settle(generation, done))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(generation, future)
+            raise TimeoutError(f"{func.__name__} did not finish within {timeout} seconds") from None
+        except asyncio.CancelledError:
+            self._abandon(generation, future)
+            raise
+
+    def _settle(self, generation: _Generation, future: Future) -> None:
+        with self._lock:
+            generation.running.discard(future)
+            generation.abandoned.discard(future)
+        self._reap(generation)
+
+    def _abandon(self, generation: _Generation, future: Future) -> None:
+        if future.cancel():
+            return
+        logger.warning("process pool call still running after timeout/cancel | retiring worker pool")
+        with self._lock:
+            if future.done():
+                return
+            generation.abandoned.add(future)
+            generation.retired = True
+            if self._generation is generation:
+                self._generation = None
+        self._reap(generation)
+
+    def _reap(self, generation: _Generation) -> None:
+        """Terminate a retired pool once every call still running in it has been abandoned."""
+        with self._lock:
+            if not generation.retired or generation.running - generation.abandoned:
+                return
+        self._terminate(generation)
+
+    def _terminate(self, generation: _Generation) -> None:
+        with self._lock:
+            if generation.terminated:
+                return
+            generation.terminated = True
+        executor = generation.executor
+        # ProcessPoolExecutor cannot cancel a running call, so stop its processes directly
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+default_pool = WarmProcessPool()
+atexit.register(default_pool.shutdown)
+
+
+def run_in_process_pool(timeout: Optional[float] = 60.0, pool: Optional[WarmProcessPool] = None):
+    """Run a tool function in a worker process instead of a thread.
+
+    Apply it beneath @tool so the tool keeps the function's name, docstring and signature.
+
+    Args:
+        timeout: Seconds before the call is abandoned and its worker terminated; None waits forever.
+        pool: Pool to run in; defaults to a shared pool sized to the CPU count.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _REGISTRY[_registry_key(func)] = func
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await (pool or default_pool).run(func, args, kwargs, timeout)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules under test live at the repository root, demo-tools/ and demo-evaluation/, which are not packages
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "demo-tools"))
+sys.path.insert(0, os.path.join(ROOT, "demo-evaluation"))
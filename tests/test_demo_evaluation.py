@@ -0,0 +1,29 @@
+import json
+
+from demo_evaluation import AgentEvaluator
+
+
+def write_cases(path, ids):
+    path.write_text(json.dumps([{"id": case_id, "query": f"question {case_id}"} for case_id in ids]))
+
+
+def test_resume_matches_records_by_id_after_cases_are_inserted_and_reordered(tmp_path, monkeypatch):
+    runs = []
+
+    async def run_case(self, agent, case, *args):
+        runs.append(case["id"])
+        return {"test_id": case["id"], "query": case["query"], "actual": f"answer {case['id']}", "error": None}
+
+    monkeypatch.setattr(AgentEvaluator, "_run_case", run_case)
+    cases_path, results_path = tmp_path / "test_cases.json", str(tmp_path / "results.jsonl")
+
+    write_cases(cases_path, ["a", "b"])
+    AgentEvaluator(cases_path, output_dir=str(tmp_path)).evaluate_agent(None, "agent", results_path=results_path)
+
+    write_cases(cases_path, ["new", "b", "a"])
+    results = AgentEvaluator(cases_path, output_dir=str(tmp_path)).evaluate_agent(
+        None, "agent", results_path=results_path, resume=True
+    )
+
+    assert runs == ["a", "b", "new"]
+    assert [(r["test_id"], r["actual"]) for r in results] == [("new", "answer new"), ("b", "answer b"), ("a", "answer a")]
@@ -0,0 +1,34 @@
+import asyncio
+
+import httpx
+
+import demo_tool_weather as weather
+import tool_results
+
+READING = {
+    "city": "Tokyo", "country": "Japan", "temp_c": "20", "temp_f": "68", "feels_like_c": "19",
+    "feels_like_f": "66", "conditions": "Clear", "humidity": "40", "wind_kmph": "8",
+}
+
+
+def test_batch_reports_only_a_404_as_not_found(monkeypatch):
+    request = httpx.Request("GET", "https://wttr.in/x")
+
+    async def fetch_weather(location):
+        if location == "Atlantis":
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+        if location == "London":
+            raise httpx.ReadTimeout("timed out", request=request)
+        return READING
+
+    monkeypatch.setattr(weather, "fetch_weather", fetch_weather)
+    monkeypatch.setattr(tool_results, "RESULT_FORMAT", "json")
+    result = asyncio.run(weather.get_weather_batch(["Tokyo", "Atlantis", "London"]))
+
+    readings = result["content"][0]["json"]["results"]
+    assert result["status"] == "success"
+    assert [(r["location"], r["status"]) for r in readings] == [
+        ("Tokyo", "success"), ("Atlantis", "error"), ("London", "error")
+    ]
+    assert readings[1]["error"] == "not found"
+    assert "unavailable" in readings[2]["error"]
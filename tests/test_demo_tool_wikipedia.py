@@ -0,0 +1,59 @@
+import asyncio
+
+import demo_tool_wikipedia as wikipedia
+from response_cache import TieredCache
+
+
+def test_summaries_follow_the_requested_order_on_a_partial_cache_hit(monkeypatch):
+    monkeypatch.setattr(wikipedia, "wiki_cache", TieredCache(max_entries=16))
+    wikipedia._store("summary", "beta", {"title": "Beta", "extract": "Cached beta.", "url": ""})
+
+    async def query_titles(titles, **params):
+        return {title: {"title": title.title(), "extract": f"Fetched {title}."} for title in titles}
+
+    monkeypatch.setattr(wikipedia, "query_titles", query_titles)
+    summaries = asyncio.run(wikipedia.fetch_summaries(["alpha", "beta", "gamma"]))
+
+    assert list(summaries) == ["alpha", "beta", "gamma"]
+    assert [summary["extract"] for summary in summaries.values()] == ["Fetched alpha.", "Cached beta.", "Fetched gamma."]
+
+
+def test_search_returns_tool_results_when_nothing_is_found_or_it_fails(monkeypatch):
+    async def no_results(query, limit):
+        return [], [], []
+
+    async def failing(query, limit):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(wikipedia, "fetch_search", no_results)
+    empty = asyncio.run(wikipedia.search_wikipedia("zzzz"))
+    assert empty == {"status": "success", "content": [{"text": "No Wikipedia articles found for 'zzzz'."}]}
+
+    monkeypatch.setattr(wikipedia, "fetch_search", failing)
+    failed = asyncio.run(wikipedia.search_wikipedia("zzzz"))
+    assert failed == {"status": "error", "content": [{"text": "Error searching Wikipedia: connection reset"}]}
+
+
+OUTLINE = [
+    {"index": "0", "heading": "Introduction", "level": 1},
+    {"index": "1", "heading": "History", "level": 2},
+    {"index": "2", "heading": "Early years", "level": 3},
+    {"index": "3", "heading": "Design", "level": 2},
+    {"index": "4", "heading": "Syntax", "level": 3},
+]
+
+
+def test_subsections_of_a_requested_section_are_not_selected_twice():
+    selected = wikipedia._select_sections(OUTLINE, ["Early years", "History", "0", "4"])
+    assert [section["index"] for section in selected] == ["1", "0", "4"]
+
+
+def test_continuation_keeps_the_page_size_of_the_first_call(monkeypatch):
+    async def fetch_content(title):
+        return {"title": "Python", "extract": "".join(str(i % 10) for i in range(250))}
+
+    monkeypatch.setattr(wikipedia, "fetch_content", fetch_content)
+    first = asyncio.run(wikipedia.get_wikipedia_content(title="Python", max_length=100))
+    cursor = first.split('cursor="')[1].split('"')[0]
+    second = asyncio.run(wikipedia.get_wikipedia_content(cursor=cursor, max_length=30))
+    assert "[Showing characters 100-200 of 250." in second
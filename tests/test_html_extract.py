@@ -0,0 +1,57 @@
+from html_extract import ContentExtractor, render_markdown
+
+ARTICLE = (
+    "<p>The quick brown fox jumps over the lazy dog, again and again, in this article body.</p>"
+    "<p>A second paragraph of real content follows, with enough words, commas, and length to score.</p>"
+)
+
+
+def extract(html):
+    extractor = ContentExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return render_markdown(extractor.sections())
+
+
+def test_unclosed_boilerplate_list_item_is_closed_by_its_sibling():
+    html = (
+        "<html><body><ul><li class='share'>Share on social<li>Real list item about foxes and dogs</ul>"
+        f"<div class='content'>{ARTICLE}</div></body></html>"
+    )
+    text = extract(html)
+    assert "Share on social" not in text
+    assert "quick brown fox" in text
+    assert "second paragraph" in text
+
+
+def test_unclosed_boilerplate_paragraph_is_closed_by_the_next_block():
+    html = f"<html><body><div><p class='footer'>Copyright footer text<div class='content'>{ARTICLE}</div></div></body></html>"
+    text = extract(html)
+    assert "Copyright footer" not in text
+    assert "quick brown fox" in text
+
+
+def test_boilerplate_is_closed_by_its_parent():
+    html = f"<html><body><div><p class='share'>Share this</div><div class='content'>{ARTICLE}</div></body></html>"
+    text = extract(html)
+    assert "Share this" not in text
+    assert "second paragraph" in text
+
+
+def test_nested_boilerplate_is_skipped_whole():
+    html = (
+        "<html><body><div class='sidebar'><div><p>Sidebar text<p>More sidebar</div>"
+        f"<ul><li>Sidebar link</ul></div><div class='content'>{ARTICLE}</div></body></html>"
+    )
+    text = extract(html)
+    assert "Sidebar" not in text
+    assert "quick brown fox" in text
+
+
+def test_list_after_an_unclosed_paragraph_is_not_nested_in_it():
+    items = "".join(f"<li>List item {i}, describing a step, with commas, and enough words to score well</li>" for i in range(6))
+    html = f"<html><body><div>{ARTICLE}<p>Steps <em>below:<ol>{items}</ol>{ARTICLE}</div></body></html>"
+    text = extract(html)
+    assert text.startswith("The quick brown fox")
+    assert "Steps below:\n\n1. List item 0" in text
+    assert "6. List item 5" in text
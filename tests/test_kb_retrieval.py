@@ -0,0 +1,55 @@
+from strands.agent.state import AgentState
+
+from kb_retrieval import ChunkLedger, pack_context
+
+CHUNK = {"id": "c1", "score": 0.9, "text": "S3 encrypts new objects by default.", "source": "s3://docs/s3.md"}
+
+
+def tool_result_message(passages):
+    return {"role": "user", "content": [{"toolResult": {"toolUseId": "t1", "status": "success",
+                                                        "content": [{"json": {"results": passages}}]}}]}
+
+
+def test_seen_chunk_is_resent_once_its_result_leaves_the_history():
+    state, messages = AgentState(), []
+    ledger = ChunkLedger(state, messages)
+    fresh, repeats = ledger.split([CHUNK])
+    packed, _ = pack_context(fresh, 1500)
+    ledger.record(packed)
+    messages.append(tool_result_message(packed))
+
+    fresh, repeats = ChunkLedger(state, messages).split([CHUNK])
+    assert fresh == [] and repeats[0]["repeat"]
+
+    # Conversation management dropped the turn holding the chunk's text
+    messages.clear()
+    fresh, repeats = ChunkLedger(state, messages).split([CHUNK])
+    assert fresh == [CHUNK] and repeats == []
+
+
+def test_only_overlapping_chunks_of_a_document_are_merged():
+    source = "s3://docs/guide.md"
+    first = {"id": "a", "score": 0.9, "text": "Buckets hold objects. Each object has a key and metadata.",
+             "source": source}
+    overlapping = {"id": "b", "score": 0.8, "text": "Each object has a key and metadata. Keys are unique per bucket.",
+                   "source": source}
+    distant = {"id": "c", "score": 0.7, "text": "Lifecycle rules move old objects to cheaper storage classes.",
+               "source": source}
+
+    passages, _ = pack_context([first, overlapping, distant], 1500)
+
+    assert [passage["id"] for passage in passages] == ["a", "c"]
+    assert passages[0]["merged_ids"] == ["b"]
+    assert passages[0]["text"] == "Buckets hold objects. Each object has a key and metadata. Keys are unique per bucket."
+
+
+def test_trimmed_chunk_is_not_recorded_as_seen():
+    long_chunk = {"id": "c2", "score": 0.8, "text": "Versioning keeps every version of an object. " * 40,
+                  "source": "s3://docs/versioning.md"}
+    state = AgentState()
+    ledger = ChunkLedger(state, [])
+    passages, report = pack_context([CHUNK, long_chunk], 100)
+    ledger.record(passages)
+
+    assert report["trimmed_chunks"] == 1
+    assert state.get("kb_seen_chunks") == ["c1"]
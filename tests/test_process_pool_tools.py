@@ -0,0 +1,59 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from process_pool_tools import WarmProcessPool, run_in_process_pool
+
+pool = WarmProcessPool(max_workers=2)
+
+
+@run_in_process_pool(timeout=1, pool=pool)
+def runaway() -> int:
+    while True:
+        time.sleep(0.05)
+
+
+@run_in_process_pool(timeout=30, pool=pool)
+def slow_pid(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.fixture(autouse=True)
+def _shutdown_pool():
+    yield
+    pool.restart()
+
+
+def test_timeout_does_not_break_sibling_call():
+    async def scenario():
+        return await asyncio.gather(runaway(), slow_pid(3), return_exceptions=True)
+
+    timed_out, sibling = asyncio.run(scenario())
+
+    assert isinstance(timed_out, TimeoutError)
+    assert isinstance(sibling, int)
+    # The retired pool is terminated once the sibling has finished
+    deadline = time.monotonic() + 5
+    while _alive(sibling) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(sibling)
+
+
+def test_new_calls_use_a_fresh_pool_after_timeout():
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            await runaway()
+        return await slow_pid(0)
+
+    assert isinstance(asyncio.run(scenario()), int)
@@ -0,0 +1,20 @@
+import importlib
+
+import tool_results
+
+
+def test_text_is_the_default_and_json_is_opt_in(monkeypatch):
+    monkeypatch.delenv("TOOL_RESULT_FORMAT", raising=False)
+    importlib.reload(tool_results)
+    data = {"city": "London", "wind": None}
+
+    assert tool_results.tool_result("t", data, text="London: 12°C")["content"] == [{"text": "London: 12°C"}]
+    assert tool_results.tool_result("t", data, text="London: 12°C", compact_json=True)["content"] == [
+        {"json": {"city": "London"}}
+    ]
+
+    monkeypatch.setattr(tool_results, "RESULT_FORMAT", "json")
+    assert tool_results.tool_result("t", data, text="London: 12°C")["content"] == [{"json": {"city": "London"}}]
+    assert tool_results.tool_result("t", data, text="London: 12°C", compact_json=False)["content"] == [
+        {"text": "London: 12°C"}
+    ]
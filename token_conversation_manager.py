@@ -0,0 +1,204 @@
+"""
+Token-budgeted conversation history for Strands agents.
+
+SlidingWindowConversationManager keeps a fixed number of messages whatever
+their size, so ten messages can be 500 tokens or 150,000, and the prompt (and
+with it latency and cost) grows with every large tool result.
+TokenBudgetConversationManager keeps the history under a token budget instead:
+
+    manager = TokenBudgetConversationManager(max_tokens=8000)
+    agent = Agent(conversation_manager=manager, hooks=[manager])
+
+When the history is over budget it is reduced in two steps:
+
+1. Large tool results (at least large_result_tokens) are evicted first, oldest
+   first: their content is replaced by a short note, and the toolUse /
+   toolResult pair stays in place, so the model still sees which calls were
+   made. Tool results the model has not answered yet are never evicted. With
+   a HistoryCompactor, the originals are kept and can be recalled by the model.
+2. If that is not enough, whole turns are dropped from the front. The history
+   is only cut before a user prompt, so a toolUse is never separated from its
+   toolResult and the history always starts with a user message.
+
+Token counts are estimates (characters / 4, as in tool_results) and are
+cached per message, so each turn only counts the messages added since the
+last one. The budget covers the message history only, not the system prompt
+or tool specs.
+
+Strands applies conversation management after each invocation. Registering
+the manager as a hook as well (hooks=[manager]) also applies it before every
+model call, so the prompt stays bounded during long tool loops.
+"""
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.hooks import BeforeModelCallEvent, HookProvider, HookRegistry
+from strands.types.content import Message, Messages
+from strands.types.exceptions import ContextWindowOverflowException
+
+from tool_results import estimate_tokens
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+    from history_compactor import HistoryCompactor
+
+logger = logging.getLogger(__name__)
+
+# Per-message overhead (role, block framing) added to the content estimate
+MESSAGE_OVERHEAD_TOKENS = 4
+# Flat estimate for image, document and video blocks, whose size is not text
+MEDIA_BLOCK_TOKENS = 1600
+
+EVICTED_RESULT_TEXT = "[Tool result removed to save context ({tokens} tokens). Call the tool again if it is needed.]"
+
+
+def _block_tokens(block: dict[str, Any]) -> int:
+    """Estimated tokens one content block contributes to the prompt."""
+    if "text" in block:
+        return estimate_tokens(block["text"])
+    if "toolUse" in block:
+        tool_use = block["toolUse"]
+        return estimate_tokens(tool_use.get("name", "") + json.dumps(tool_use.get("input"), default=str))
+    if "toolResult" in block:
+        return sum(_block_tokens(item) for item in block["toolResult"].get("content", []))
+    if "json" in block:
+        return estimate_tokens(json.dumps(block["json"], ensure_ascii=False, separators=(",", ":"), default=str))
+    if "reasoningContent" in block:
+        return estimate_tokens(block["reasoningContent"].get("reasoningText", {}).get("text", ""))
+    if any(media in block for media in ("image", "document", "video")):
+        return MEDIA_BLOCK_TOKENS
+    return estimate_tokens(json.dumps(block, default=str))
+
+
+def message_tokens(message: Message) -> int:
+    """Estimated tokens of one message."""
+    return MESSAGE_OVERHEAD_TOKENS + sum(_block_tokens(block) for block in message.get("content", []))
+
+
+def _has(message: Message, block_type: str) -> bool:
+    return any(block_type in block for block in message.get("content", []))
+
+
+def _is_prompt(message: Message) -> bool:
+    """A user message that starts a turn (not a toolResult answer)."""
+    return message["role"] == "user" and not _has(message, "toolResult")
+
+
+class TokenBudgetConversationManager(ConversationManager, HookProvider):
+    """Keeps the conversation history under a token budget.
+
+    Args:
+        max_tokens: Estimated tokens the message history may use.
+        large_result_tokens: Tool results at least this large are evicted before whole turns are dropped.
+        compactor: If given, evicted results are kept in its store and replaced by recallable stubs.
+    """
+
+    def __init__(
+        self, max_tokens: int = 20_000, large_result_tokens: int = 500, compactor: Optional["HistoryCompactor"] = None
+    ):
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.large_result_tokens = large_result_tokens
+        self.compactor = compactor
+        self.evicted_results = 0
+        # id(message) -> (message, its content list, token count); holding the message keeps its id unique
+        self._counts: dict[int, tuple[Message, list, int]] = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, lambda event: self.apply_management(event.agent))
+
+    def count(self, message: Message) -> int:
+        """Token estimate of a message, counted once and cached until its content list is replaced."""
+        entry = self._counts.get(id(message))
+        if entry is not None and entry[0] is message and entry[1] is message.get("content"):
+            return entry[2]
+        tokens = message_tokens(message)
+        self._counts[id(message)] = (message, message.get("content"), tokens)
+        return tokens
+
+    def total_tokens(self, messages: Messages) -> int:
+        total = sum(self.count(message) for message in messages)
+        # Forget messages that have left the history
+        if len(self._counts) > len(messages):
+            live = {id(message) for message in messages}
+            self._counts = {key: entry for key, entry in self._counts.items() if key in live}
+        return total
+
+    def apply_management(self, agent: "Agent", **kwargs: Any) -> None:
+        """Reduce the history if it is over the token budget."""
+        total = self.total_tokens(agent.messages)
+        if total <= self.max_tokens:
+            logger.debug("tokens=<%d>, max_tokens=<%d> | skipping context reduction", total, self.max_tokens)
+            return
+        total = self._reduce(agent.messages, total, self.max_tokens)
+        if total > self.max_tokens:
+            logger.warning(
+                "tokens=<%d>, max_tokens=<%d> | current turn alone exceeds the token budget", total, self.max_tokens
+            )
+
+    def reduce_context(self, agent: "Agent", e: Optional[Exception] = None, **kwargs: Any) -> None:
+        """Called on a context window overflow: cut the history to half its size, or raise if it cannot shrink."""
+        messages = agent.messages
+        total = self.total_tokens(messages)
+        reduced = self._reduce(messages, total, min(self.max_tokens, total // 2))
+        if reduced >= total:
+            raise ContextWindowOverflowException("Unable to trim conversation context!") from e
+
+    def _reduce(self, messages: Messages, total: int, budget: int) -> int:
+        """Evict large tool results, then drop the oldest turns, until total fits in budget. Returns the new total."""
+        # Step 1: large tool results, oldest first; the last message's results are still unanswered
+        for index, message in enumerate(messages[:-1]):
+            if total <= budget:
+                return total
+            if message["role"] == "user" and _has(message, "toolResult"):
+                total += self._evict_results(message, messages[index - 1] if index else None)
+
+        # Step 2: drop whole turns, cutting only before a user prompt and keeping the current turn
+        cut, removed = 0, 0
+        for index in range(1, len(messages)):
+            if total <= budget:
+                break
+            removed += self.count(messages[index - 1])
+            if _is_prompt(messages[index]):
+                cut, total, removed = index, total - removed, 0
+        if cut:
+            self.removed_message_count += cut
+            messages[:] = messages[cut:]
+            logger.debug("removed=<%d>, tokens=<%d> | trimmed conversation history", cut, total)
+        return total
+
+    def _evict_results(self, message: Message, tool_use_message: Optional[Message]) -> int:
+        """Replace the large tool results in a message with a note. Returns the change in its token count."""
+        before = self.count(message)
+        tool_names = {
+            block["toolUse"]["toolUseId"]: block["toolUse"]["name"]
+            for block in (tool_use_message or {}).get("content", []) if "toolUse" in block
+        }
+        content, evicted = [], 0
+        for block in message["content"]:
+            if "toolResult" in block and _block_tokens(block) >= self.large_result_tokens:
+                result = block["toolResult"]
+                tool_name = tool_names.get(result["toolUseId"], "tool")
+                stub = self.compactor and self.compactor.stub(tool_name, result["content"])
+                note = stub or [{"text": EVICTED_RESULT_TEXT.format(tokens=_block_tokens(block))}]
+                block = {"toolResult": {"toolUseId": result["toolUseId"], "status": result.get("status", "success"),
+                                        "content": note}}
+                evicted += 1
+            content.append(block)
+        if not evicted:
+            return 0
+        # A new content list, so the cached count is replaced
+        message["content"] = content
+        self.evicted_results += evicted
+        return self.count(message) - before
+
+    def get_state(self) -> dict[str, Any]:
+        return {**super().get_state(), "evicted_results": self.evicted_results}
+
+    def restore_from_session(self, state: dict[str, Any]) -> Optional[list[Message]]:
+        self.evicted_results = state.get("evicted_results", 0)
+        return super().restore_from_session(state)
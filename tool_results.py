@@ -0,0 +1,116 @@
+"""
+Compact, measured tool results.
+
+Whatever a tool returns is added to the conversation history and re-sent to
+the model on every later turn, so a result padded with markdown headings and
+emoji costs tokens again and again. tool_result() builds a ToolResult that
+can carry a single JSON block holding just the data:
+
+    @tool
+    async def get_weather(location: str) -> dict:
+        weather = await fetch_weather(location)
+        return tool_result("get_weather", weather, text=lambda: format_weather(weather))
+
+Strands passes a returned dict with "status" and "content" through as the
+tool result. By default it holds the tool's human-readable rendering, as
+before; set TOOL_RESULT_FORMAT=json, or pass compact_json=True, to send the
+compact JSON block instead (models without JSON tool-result support should
+stay on text). Results with no text rendering are always sent as JSON.
+
+Every result is measured with a rough token estimate (characters / 4), and
+the totals per tool are kept in result_meter for comparing the two formats.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# "json" sends compact JSON content blocks; "text" sends the tools' human-readable rendering
+RESULT_FORMAT = os.environ.get("TOOL_RESULT_FORMAT", "text")
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a string, good enough for comparing result sizes."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact(data: Any) -> Any:
+    """Drop None values, empty strings and empty containers, recursively."""
+    if isinstance(data, dict):
+        pruned = {key: compact(value) for key, value in data.items()}
+        return {key: value for key, value in pruned.items() if value not in (None, "", [], {})}
+    if isinstance(data, (list, tuple)):
+        return [compact(value) for value in data]
+    return data
+
+
+@dataclass
+class ResultSize:
+    calls: int = 0
+    tokens: int = 0
+    chars: int = 0
+
+
+class ResultMeter:
+    """Running totals of result sizes per tool."""
+
+    def __init__(self):
+        self._sizes: dict[str, ResultSize] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name: str, rendered: str) -> int:
+        tokens = estimate_tokens(rendered)
+        with self._lock:
+            size = self._sizes.setdefault(tool_name, ResultSize())
+            size.calls += 1
+            size.tokens += tokens
+            size.chars += len(rendered)
+        logger.debug("tool=<%s>, tokens=<%d> | tool result built", tool_name, tokens)
+        return tokens
+
+    def report(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {name: asdict(size) for name, size in self._sizes.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sizes.clear()
+
+
+result_meter = ResultMeter()
+
+
+def tool_result(
+    tool_name: str,
+    data: Any,
+    text: Optional[Union[str, Callable[[], str]]] = None,
+    status: str = "success",
+    compact_json: Optional[bool] = None,
+) -> dict[str, Any]:
+    """Build a ToolResult from structured data.
+
+    Args:
+        tool_name: Name the result size is recorded under.
+        data: JSON-serializable result; None values and empty fields are dropped.
+        text: Human-readable rendering (or a function producing it), used in text mode.
+        status: "success" or "error".
+        compact_json: Force JSON (True) or text (False); defaults to TOOL_RESULT_FORMAT.
+    """
+    use_json = RESULT_FORMAT == "json" if compact_json is None else compact_json
+    if use_json or text is None:
+        data = compact(data)
+        rendered = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        block = {"json": data}
+    else:
+        rendered = text() if callable(text) else text
+        block = {"text": rendered}
+
+    result_meter.record(tool_name, rendered)
+    return {"status": status, "content": [block]}